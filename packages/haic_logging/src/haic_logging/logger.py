@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
+import os
 import platform
+import queue
+import shutil
+import sys
 import threading
 import time
 import uuid
-from dataclasses import dataclass
+import zlib
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 import psutil
 
@@ -20,12 +27,37 @@ from .schema import (
     EVENTS_SCHEMA_VERSION,
     DECISIONS_ARTIFACT_SCHEMA,
 )
-from .sinks import append_jsonl, write_json
+from .sinks import (
+    append_bytes,
+    dumps,
+    open_append_fd,
+    write_fd,
+    write_fd_vectored,
+    write_json,
+    write_json_with_jsonl,
+)
 
 logger = logging.getLogger(__name__)
 
 JsonDict = Dict[str, Any]
 
+_now = time.time
+_now_ns = time.time_ns
+
+# The writer thread writes a batch once this many bytes are pending
+_WRITE_BATCH_MAX_BYTES = 1024 * 1024
+
+# Writer-queue control items (event lines are bytes; flush markers are Events)
+_TICK = object()
+_STOP = object()
+
+_WRITE_QUEUE_POLICIES = ("block", "drop")
+
+# Logger attributes copied into every event's context
+_CONTEXT_FIELDS = frozenset(
+    {"run_id", "session_id", "pilot_tag", "app_version", "app_mode", "model_name", "model_version"}
+)
+
 
 def _to_float_or_none(x):
     if x is None:
@@ -40,29 +72,92 @@ def _to_float_or_none(x):
     return None
 
 
+class _GpuSampler:
+    """
+    Process-wide NVML access for GPU 0.
+
+    NVML is initialised on first use and shut down at interpreter exit, so
+    each sample is a single nvmlDeviceGetUtilizationRates call. If pynvml is
+    missing or initialisation fails, sampling is disabled for the process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._nvml: Any = None
+        self._handle: Any = None
+        self._unavailable = False
+
+    def _ensure_handle(self) -> bool:
+        if self._handle is not None:
+            return True
+        if self._unavailable:
+            return False
+        # Make pynvml optional (no hard dependency)
+        try:
+            import pynvml  # type: ignore
+            pynvml.nvmlInit()
+        except Exception:
+            self._unavailable = True
+            return False
+        try:
+            self._handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        except Exception:
+            self._unavailable = True
+            try:
+                pynvml.nvmlShutdown()
+            except Exception:
+                pass
+            return False
+        self._nvml = pynvml
+        atexit.register(self.shutdown)
+        return True
+
+    def usage_percent(self) -> Optional[float]:
+        with self._lock:
+            if not self._ensure_handle():
+                return None
+            try:
+                return float(self._nvml.nvmlDeviceGetUtilizationRates(self._handle).gpu)
+            except Exception:
+                return None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._nvml is None:
+                return
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+            self._nvml = None
+            self._handle = None
+
+
+_GPU_SAMPLER = _GpuSampler()
+
+
 def _optional_gpu_usage_percent() -> Optional[float]:
-    # Make pynvml optional (no hard dependency)
-    try:
-        import pynvml  # type: ignore
-        pynvml.nvmlInit()
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-        pynvml.nvmlShutdown()
-        return float(util.gpu)
-    except Exception:
-        return None
+    return _GPU_SAMPLER.usage_percent()
+
+
+@functools.lru_cache(maxsize=1)
+def _static_machine_info() -> JsonDict:
+    # Host facts do not change during the process lifetime; query psutil once
+    freq = psutil.cpu_freq()
+    return {
+        "hostname": platform.node(),
+        "os": f"{platform.system()} {platform.release()}",
+        "cpu_model_mhz": freq.current if freq else 0.0,
+        "cpu_count": psutil.cpu_count(),
+        "ram_total_gb": float(psutil.virtual_memory().total >> 30),
+        "disk_total_gb": float(psutil.disk_usage("/").total >> 30),
+    }
 
 
 def get_machine_metrics() -> JsonDict:
     try:
-        metrics: JsonDict = {
-            "hostname": platform.node(),
-            "os": f"{platform.system()} {platform.release()}",
-            "cpu_model_mhz": psutil.cpu_freq().current if psutil.cpu_freq() else 0.0,
-            "cpu_count": psutil.cpu_count(),
-            "ram_total_gb": float(psutil.virtual_memory().total >> 30),
-            "disk_total_gb": float(psutil.disk_usage("/").total >> 30),
-        }
+        # copy: callers attach per-run data (e.g. resource_usage) to the result
+        metrics: JsonDict = dict(_static_machine_info())
         gpu = _optional_gpu_usage_percent()
         if gpu is not None:
             metrics["gpu_usage_percent"] = gpu
@@ -72,25 +167,184 @@ def get_machine_metrics() -> JsonDict:
         return {"hostname": "unknown", "os": "unknown"}
 
 
-def _resource_tracker(stop_flag: threading.Event, dest: JsonDict, interval_s: int) -> None:
-    while not stop_flag.is_set():
+def _disk_usage_percent(path: str = "/") -> float:
+    # Same figure as psutil.disk_usage(path).percent (used vs. space available
+    # to unprivileged users), from a single statvfs via shutil
+    du = shutil.disk_usage(path)
+    avail = du.used + du.free
+    return round(du.used * 100.0 / avail, 1) if avail else 0.0
+
+
+class _LinuxProcSampler:
+    """
+    CPU and RAM utilisation read straight from /proc/stat and /proc/meminfo.
+
+    Both files stay open and are re-read from offset 0 on each sample, which
+    is much cheaper than psutil's generic path at high sampling rates. The
+    figures match psutil.cpu_percent(interval=None) and
+    psutil.virtual_memory().percent.
+    """
+
+    def __init__(self) -> None:
+        self._stat = open("/proc/stat", "rb", buffering=0)
+        self._meminfo = open("/proc/meminfo", "rb", buffering=0)
         try:
-            sample: JsonDict = {
-                "t": time.time(),
-                "cpu_usage_percent": psutil.cpu_percent(),
-                "ram_usage_percent": psutil.virtual_memory().percent,
-                "disk_usage_percent": psutil.disk_usage("/").percent,
-            }
-            gpu = _optional_gpu_usage_percent()
-            if gpu is not None:
-                sample["gpu_usage_percent"] = gpu
-            dest.setdefault("resource_usage", []).append(sample)
+            self._prev = self._cpu_times()
+            self.ram_percent()  # fail now (e.g. no MemAvailable) rather than per sample
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def create(cls) -> Optional["_LinuxProcSampler"]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls()
         except Exception as e:
-            logger.debug(f"Resource tracking error: {e}")
-        stop_flag.wait(interval_s)
+            logger.debug(f"/proc sampler unavailable, using psutil: {e}")
+            return None
+
+    def _cpu_times(self) -> Tuple[int, int]:
+        # aggregate line: "cpu  user nice system idle iowait irq softirq steal guest guest_nice"
+        self._stat.seek(0)
+        fields = self._stat.read(512).split(b"\n", 1)[0].split()
+        vals = [int(x) for x in fields[1:9]]
+        # guest time is already included in user/nice
+        total = sum(vals)
+        idle = vals[3] + (vals[4] if len(vals) > 4 else 0)
+        return total - idle, total
+
+    def cpu_percent(self) -> float:
+        busy, total = self._cpu_times()
+        prev_busy, prev_total = self._prev
+        self._prev = (busy, total)
+        dt = total - prev_total
+        if dt <= 0:
+            return 0.0
+        return round(min(100.0, max(0.0, (busy - prev_busy) * 100.0 / dt)), 1)
+
+    def ram_percent(self) -> float:
+        self._meminfo.seek(0)
+        total = avail = None
+        for line in self._meminfo.read().split(b"\n"):
+            if line.startswith(b"MemTotal:"):
+                total = int(line.split()[1])
+            elif line.startswith(b"MemAvailable:"):
+                avail = int(line.split()[1])
+                break
+        if not total or avail is None:
+            raise ValueError("MemTotal/MemAvailable missing from /proc/meminfo")
+        return round((total - avail) * 100.0 / total, 1)
+
+    def close(self) -> None:
+        self._stat.close()
+        self._meminfo.close()
 
 
-@dataclass
+def _resource_tracker(stop_flag: threading.Event, samples: List[JsonDict], interval_s: float) -> None:
+    now = time.time
+    mono = time.monotonic
+    disk_percent = _disk_usage_percent
+    proc = _LinuxProcSampler.create()
+    if proc is not None:
+        cpu_percent = proc.cpu_percent
+        ram_percent = proc.ram_percent
+    else:
+        # non-blocking: utilisation since the previous sample
+        cpu_percent = functools.partial(psutil.cpu_percent, interval=None)
+
+        def ram_percent() -> float:
+            return psutil.virtual_memory().percent
+
+    try:
+        while not stop_flag.is_set():
+            try:
+                sample: JsonDict = {
+                    "t": now(),
+                    # wall clock can step (NTP); use t_mono for rates/intervals
+                    "t_mono": mono(),
+                    "cpu_usage_percent": cpu_percent(),
+                    "ram_usage_percent": ram_percent(),
+                    "disk_usage_percent": disk_percent(),
+                }
+                gpu = _optional_gpu_usage_percent()
+                if gpu is not None:
+                    sample["gpu_usage_percent"] = gpu
+                samples.append(sample)
+            except Exception as e:
+                logger.debug(f"Resource tracking error: {e}")
+            stop_flag.wait(interval_s)
+    finally:
+        if proc is not None:
+            proc.close()
+
+
+def _event_writer(q: Any, write: Callable[..., None], interval_s: float) -> None:
+    """
+    Drain serialized event lines from q and hand them to write() in batches.
+
+    A batch is written when it reaches _WRITE_BATCH_MAX_BYTES, when its oldest
+    line is interval_s old (no age limit if interval_s <= 0), or when a flush
+    marker (a threading.Event, set once written) or _STOP is dequeued.
+    """
+    mono = time.monotonic
+    batch: List[bytes] = []
+    size = 0
+    deadline = 0.0
+    while True:
+        if batch and interval_s > 0:
+            try:
+                item = q.get(timeout=max(deadline - mono(), 0.0))
+            except queue.Empty:
+                item = _TICK
+        else:
+            item = q.get()
+
+        if type(item) is bytes:
+            if not batch:
+                deadline = mono() + interval_s
+            batch.append(item)
+            size += len(item)
+            if size < _WRITE_BATCH_MAX_BYTES:
+                continue
+
+        stop = item is _STOP
+        if batch or stop:
+            try:
+                write(batch, final=stop)
+            except Exception as e:
+                logger.warning(f"Event write error: {e}")
+            batch = []
+            size = 0
+        if stop:
+            return
+        if isinstance(item, threading.Event):
+            item.set()
+
+
+class _ContextField:
+    """
+    Wraps the slot of a logger attribute copied into event contexts: assigning
+    it drops the cached base context (e.g. model_version bumped after
+    retraining), so the next event picks up the new value. Other attributes
+    keep plain slot writes.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: Any) -> None:
+        self.slot = slot
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        return self if obj is None else self.slot.__get__(obj, owner)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+        obj._base_context = None
+
+
+@dataclass(slots=True)
 class HaicLogger:
     log_dir: Path
     pilot_tag: str = DEFAULT_PILOT_TAG
@@ -107,33 +361,70 @@ class HaicLogger:
     human: Optional[JsonDict] = None
 
     enable_resource_tracking: bool = False
-    resource_interval_s: int = 10
+    resource_interval_s: float = 10.0
+
+    # Event stream writes happen on a background thread: log_event only
+    # serializes and enqueues. A batch is written once it reaches
+    # _WRITE_BATCH_MAX_BYTES, is flush_interval_ms old (0 disables the timer),
+    # on export and on close. flush_sync fsyncs after each write.
+    flush_interval_ms: int = 50
+    flush_sync: bool = False
+
+    # Bound the writer queue (0 = unbounded). When it is full, "block" makes
+    # log_event wait for the writer; "drop" discards the event and counts it
+    # in dropped_events.
+    write_queue_size: int = 0
+    write_queue_policy: str = "block"
+
+    # Write the event stream gzip-compressed (run_<id>.jsonl.gz). Each flush
+    # ends on a deflate sync point, so the file is readable up to the last
+    # flush while the session is still open.
+    compress: bool = False
+
+    # Keep every event in memory as well as in the JSONL stream. Off by default:
+    # long sessions would grow without bound, and export reads events back
+    # from the stream instead.
+    retain_events: bool = False
+
+    # Event ids default to "<run_id>-<seq>"; pass e.g. lambda: str(uuid.uuid4())
+    # when ids must not be derivable from the run
+    event_id_factory: Optional[Callable[[], str]] = None
 
     # Internals
     session_id: str = ""
     run_id: str = ""
-    _event_seq: int = 0
-    _decision_seq: int = 0
-    _events: List[JsonDict] = None  # type: ignore
-    _decisions: List[JsonDict] = None  # type: ignore
-    _machine: JsonDict = None  # type: ignore
-    _stop_evt: threading.Event = None  # type: ignore
-    _tracker_thread: Optional[threading.Thread] = None
-    _start_time: float = 0.0
-    _end_time: Optional[float] = None
+    _event_seq: int = field(default=0, init=False, repr=False)
+    _decision_seq: int = field(default=0, init=False, repr=False)
+    _events: List[JsonDict] = field(default_factory=list, init=False, repr=False)
+    _decisions: List[JsonDict] = field(default_factory=list, init=False, repr=False)
+    _machine: JsonDict = field(default_factory=get_machine_metrics, init=False, repr=False)
+    _stop_evt: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _tracker_thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _write_q: Any = field(default=None, init=False, repr=False)
+    _writer_thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _exit_hook: Optional[Callable[[], None]] = field(default=None, init=False, repr=False)
+    _dropped_events: int = field(default=0, init=False, repr=False)
+    _events_fd: Optional[int] = field(default=None, init=False, repr=False)
+    _compressor: Any = field(default=None, init=False, repr=False)
+    _base_context: Optional[JsonDict] = field(default=None, init=False, repr=False)
+    _start_time: float = field(default_factory=time.time, init=False, repr=False)
+    _end_time: Optional[float] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.log_dir = Path(self.log_dir)
         self.session_id = str(uuid.uuid4())
         self.run_id = str(uuid.uuid4())
-        self._event_seq = 0
-        self._decision_seq = 0
-        self._events = []
-        self._decisions = []
-        self._machine = get_machine_metrics()
-        self._stop_evt = threading.Event()
-        self._start_time = time.time()
-        self._end_time = None
+        if self.write_queue_policy not in _WRITE_QUEUE_POLICIES:
+            raise ValueError(f"write_queue_policy must be one of {_WRITE_QUEUE_POLICIES}, got {self.write_queue_policy!r}")
+        if self.write_queue_size > 0:
+            self._write_q = queue.Queue(maxsize=self.write_queue_size)
+        else:
+            self._write_q = queue.SimpleQueue()
+        if self.compress:
+            # wbits=31: gzip container, so standard tools can read the stream
+            self._compressor = zlib.compressobj(wbits=31)
+        # The events path is fixed once run_id is assigned; keep it open for the session
+        self._events_fd = open_append_fd(self.events_path)
 
         if self.inference_config is None:
             self.inference_config = {}
@@ -150,13 +441,28 @@ class HaicLogger:
 
         # Optional resource tracking
         if self.enable_resource_tracking:
+            # the tracker appends to this list directly; it is exported with the machine info
+            samples: List[JsonDict] = []
+            self._machine["resource_usage"] = samples
             self._tracker_thread = threading.Thread(
                 target=_resource_tracker,
-                args=(self._stop_evt, self._machine, self.resource_interval_s),
+                args=(self._stop_evt, samples, self.resource_interval_s),
                 daemon=True,
             )
             self._tracker_thread.start()
 
+        self._writer_thread = threading.Thread(
+            target=_event_writer,
+            args=(self._write_q, self._write_batch, self.flush_interval_ms / 1000.0),
+            daemon=True,
+        )
+        self._writer_thread.start()
+        # The writer is a daemon thread: without this, events still queued (and
+        # the gzip trailer) are lost when the program exits without close().
+        # The writer already holds the logger until close(), which unregisters it.
+        self._exit_hook = self.close
+        atexit.register(self._exit_hook)
+
         # Emit session_start event (mirrors your pattern)
         self.log_event(
             event_type="session_start",
@@ -164,14 +470,31 @@ class HaicLogger:
             payload={"pilot_tag": self.pilot_tag, "app_mode": self.app_mode},
         )
 
+    def _event_context(self) -> JsonDict:
+        return {
+            "run_id": self.run_id,
+            "session_id": self.session_id,
+            "pilot_tag": self.pilot_tag,
+            "app_version": self.app_version,
+            "app_mode": self.app_mode,
+            "model_name": self.model_name,
+            "model_version": self.model_version,
+        }
+
     @property
     def events_path(self) -> Path:
-        return self.log_dir / f"run_{self.run_id}.jsonl"
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        return self.log_dir / f"run_{self.run_id}{suffix}"
 
     @property
     def decisions_path(self) -> Path:
         return self.log_dir / f"haic_decisions_{self.run_id}.json"
 
+    @property
+    def dropped_events(self) -> int:
+        """Events discarded because the bounded writer queue was full."""
+        return self._dropped_events
+
     def run_metadata(self) -> JsonDict:
         return {
             "schema_version": HAIC_SCHEMA_VERSION,
@@ -203,36 +526,105 @@ class HaicLogger:
         payload: Optional[JsonDict] = None,
         context_overrides: Optional[JsonDict] = None,
         t: Optional[float] = None,
+        durable: bool = False,
     ) -> JsonDict:
         payload = payload or {}
-        context_overrides = context_overrides or {}
-        t = t if t is not None else time.time()
-
-        self._event_seq += 1
+        # t_ns is exact (integer nanoseconds) for ordering/keys; t stays for readers
+        if t is None:
+            t_ns = _now_ns()
+            t = t_ns / 1e9
+        else:
+            # a float epoch only carries ~microsecond precision
+            t_ns = round(t * 1e6) * 1000
+
+        # The base context is built once and cached; each event gets its own
+        # copy, so callers editing a returned event cannot alter later ones
+        context = self._base_context
+        if context is None:
+            context = self._base_context = self._event_context()
+        if context_overrides:
+            context = {**context, **context_overrides}
+        else:
+            context = dict(context)
+
+        seq = self._event_seq + 1
+        self._event_seq = seq
+        factory = self.event_id_factory
         event: JsonDict = {
             "schema_version": EVENTS_SCHEMA_VERSION,
-            "event_id": str(uuid.uuid4()),
+            "event_id": factory() if factory is not None else f"{self.run_id}-{seq}",
             "event_type": event_type,
             "t": t,
-            "seq": self._event_seq,
+            "t_ns": t_ns,
+            "seq": seq,
             "actor": actor,  # "human"|"ai"|"system"
-            "context": {
-                "run_id": self.run_id,
-                "session_id": self.session_id,
-                "pilot_tag": self.pilot_tag,
-                "app_version": self.app_version,
-                "app_mode": self.app_mode,
-                "model_name": self.model_name,
-                "model_version": self.model_version,
-                **context_overrides,
-            },
+            "context": context,
             "payload": payload,
         }
 
-        self._events.append(event)
-        append_jsonl(self.events_path, event)
+        if self.retain_events:
+            self._events.append(event)
+        # One encoder call per event: splicing a pre-encoded context fragment
+        # measured no faster with orjson and slower with the stdlib encoder
+        line = dumps(event) + b"\n"
+        if self._writer_thread is None:
+            # already closed: write synchronously
+            self._write_batch([line])
+        elif self.write_queue_policy == "drop":
+            try:
+                self._write_q.put_nowait(line)
+            except queue.Full:
+                self._dropped_events += 1
+        else:
+            self._write_q.put(line)
+        if durable:
+            self.commit()
         return event
 
+    def commit(self, *, sync: bool = True) -> None:
+        """
+        Write every event logged so far; with sync=True, also wait until it
+        is on disk (fdatasync).
+
+        log_event returns once the event is queued, not once it is durable.
+        Commit at the points that need durability; close() implies commit().
+        """
+        self._flush()
+        fd = self._events_fd
+        if sync and fd is not None:
+            getattr(os, "fdatasync", os.fsync)(fd)
+
+    def _flush(self) -> None:
+        """Block until every event enqueued so far has been written."""
+        if self._writer_thread is None:
+            return
+        done = threading.Event()
+        self._write_q.put(done)
+        done.wait()
+
+    def _write_batch(self, lines: List[bytes], *, final: bool = False) -> None:
+        # Runs on the writer thread (or the caller's, once closed)
+        fd = self._events_fd
+        comp = self._compressor
+        if fd is not None and comp is None:
+            # plain stream: hand the lines to the kernel as-is, one writev per batch
+            write_fd_vectored(fd, lines, sync=self.flush_sync or final)
+            return
+        data = b"".join(lines)
+        if fd is None:
+            # already closed: fall back to a one-off append (a new gzip member
+            # when compressing; readers handle concatenated members)
+            if data:
+                if self.compress:
+                    data = zlib.compress(data, wbits=31)
+                append_bytes(self.events_path, data, sync=self.flush_sync)
+            return
+        # sync point per batch keeps the file readable; finish writes the trailer
+        data = comp.compress(data) + comp.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        if final:
+            self._compressor = None
+        write_fd(fd, data, sync=self.flush_sync or final)
+
     def log_decision(
         self,
         *,
@@ -246,12 +638,13 @@ class HaicLogger:
         t: Optional[float] = None,
     ) -> JsonDict:
         payload = payload or {}
-        t = t if t is not None else time.time()
+        t = t if t is not None else _now()
 
-        self._decision_seq += 1
+        seq = self._decision_seq + 1
+        self._decision_seq = seq
         entry: JsonDict = {
             "schema_version": DECISION_SCHEMA_VERSION,
-            "seq": self._decision_seq,
+            "seq": seq,
             "t": t,
             "actor_type": actor_type,
             "action": action,
@@ -266,6 +659,7 @@ class HaicLogger:
         return entry
 
     def export_decisions_artifact(self, filename: Optional[str] = None) -> Path:
+        self._flush()
         rm = self.run_metadata()
         artifact: JsonDict = {
             "artifact_schema": DECISIONS_ARTIFACT_SCHEMA,
@@ -281,16 +675,23 @@ class HaicLogger:
                 "infrastructure": self._machine,
                 "timestamps": rm.get("timestamps", {}),
             },
-            "decisions": list(self._decisions),
-            # optional raw events for debugging
-            "events": list(self._events),
+            # Serialized right away, so the live list is passed without copying
+            "decisions": self._decisions,
         }
 
+        # optional raw events for debugging
         out = Path(filename) if filename else self.decisions_path
-        write_json(out, artifact)
+        if self.retain_events:
+            artifact["events"] = self._events
+            write_json(out, artifact)
+        else:
+            write_json_with_jsonl(out, artifact, "events", self.events_path)
         return out
 
     def close(self) -> None:
+        if self._exit_hook is not None:
+            atexit.unregister(self._exit_hook)
+            self._exit_hook = None
         if self._end_time is None:
             self._end_time = time.time()
 
@@ -298,12 +699,26 @@ class HaicLogger:
         self.log_event(event_type="session_end", actor="system", payload={"session_end_time": self._end_time})
 
         # stop resource tracking
+        self._stop_evt.set()
         if self.enable_resource_tracking and self._tracker_thread:
-            self._stop_evt.set()
             self._tracker_thread.join(timeout=5)
 
+        # drain the writer; its final write fsyncs the stream
+        if self._writer_thread is not None:
+            self._write_q.put(_STOP)
+            self._writer_thread.join()
+            self._writer_thread = None
+        if self._events_fd is not None:
+            os.close(self._events_fd)
+            self._events_fd = None
+
     def __enter__(self) -> "HaicLogger":
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
+
+
+for _name in _CONTEXT_FIELDS:
+    setattr(HaicLogger, _name, _ContextField(getattr(HaicLogger, _name)))
+del _name
@@ -1,15 +1,23 @@
 
 
+import asyncio
+import atexit
+import collections
+import contextvars
+import functools
 import json
+import os
 import time
 import threading
 import psutil
 import platform
 import uuid
 import logging
-from typing import Dict, Optional, Any
+import mmap
+from typing import Dict, Iterable, List, Optional, Any
 from pathlib import Path
-import pynvml
+
+from .sinks import EventWriter, dumps, loads, write_json, write_json_with_raw_array
 
 logger = logging.getLogger(__name__)
 
@@ -21,25 +29,47 @@ DEFAULT_PILOT_TAG = "radiology-toy"
 DEFAULT_APP_NAME = "annotation_tool"
 DEFAULT_APP_VERSION = "0.1.0"
 
+_now_ns = time.time_ns
+
+
+def _none(_x):
+    return None
+
+
+def _identity(x):
+    return x
+
+
+def _str_to_float(x):
+    try:
+        return float(x)
+    except ValueError:
+        return None
+
+
+# Exact-type dispatch (one dict lookup); subclasses such as numpy scalars take
+# the isinstance path below
+_FLOAT_CONV = {type(None): _none, int: float, bool: float, float: float, str: _str_to_float}
+_STR_CONV = {type(None): _none, str: _identity, list: _none, dict: _none}
+
 
 def _to_float_or_none(x):
     """Convert x to float if possible, else None (for DB-safe numeric fields)."""
-    if x is None:
-        return None
+    conv = _FLOAT_CONV.get(type(x))
+    if conv is not None:
+        return conv(x)
     if isinstance(x, (int, float)):
         return float(x)
     if isinstance(x, str):
-        try:
-            return float(x)
-        except ValueError:
-            return None
+        return _str_to_float(x)
     return None
 
 
 def _to_str_or_none(x):
     """Convert x to str if meaningful, else None (for DB-safe text fields)."""
-    if x is None:
-        return None
+    conv = _STR_CONV.get(type(x))
+    if conv is not None:
+        return conv(x)
     if isinstance(x, str):
         return x
     if isinstance(x, (list, dict)):
@@ -58,34 +88,59 @@ def get_run_id() -> str:
 
 
 def get_event_id() -> str:
-    """Generate a unique event ID."""
-    return str(uuid.uuid4())
+    """Generate a unique event ID (128 random bits as hex; called once per event)."""
+    return os.urandom(16).hex()
+
+
+# NVML is initialised once per process and shut down at exit
+_nvml = None
+_nvml_handle = None
+_nvml_failed = False
+_nvml_lock = threading.Lock()
 
 
 def get_gpu_usage():
+    global _nvml, _nvml_handle, _nvml_failed
     try:
-        pynvml.nvmlInit()
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-        pynvml.nvmlShutdown()
-        return util.gpu
+        with _nvml_lock:
+            if _nvml_handle is None:
+                if _nvml_failed:
+                    return 0.0
+                try:
+                    import pynvml  # optional; no hard dependency
+                    pynvml.nvmlInit()
+                    _nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                except Exception:
+                    _nvml_failed = True
+                    return 0.0
+                _nvml = pynvml
+                atexit.register(pynvml.nvmlShutdown)
+            return _nvml.nvmlDeviceGetUtilizationRates(_nvml_handle).gpu
     except:
         return 0.0
 
 
+@functools.lru_cache(maxsize=1)
+def _static_machine_metrics() -> Dict[str, Any]:
+    """Host facts that do not change during the process lifetime (queried once)."""
+    freq = psutil.cpu_freq()
+    return {
+        "hostname": platform.node(),
+        "os": f"{platform.system()} {platform.release()}",
+        "cpu_model": freq.current if freq else 0,  # MHz
+        "cpu_count": psutil.cpu_count(),
+        "ram_total": psutil.virtual_memory().total >> 30,  # GB
+        "disk_total": psutil.disk_usage("/").total >> 30,  # GB
+    }
+
+
 def get_machine_metrics() -> Dict[str, Any]:
     """Get comprehensive machine metrics."""
     try:
         gpu_usage = get_gpu_usage()
 
-        metrics = {
-            "hostname": platform.node(),
-            "os": f"{platform.system()} {platform.release()}",
-            "cpu_model": psutil.cpu_freq().current if psutil.cpu_freq() else 0,  # MHz
-            "cpu_count": psutil.cpu_count(),
-            "ram_total": psutil.virtual_memory().total >> 30,  # GB
-            "disk_total": psutil.disk_usage("/").total >> 30,  # GB
-        }
+        # copy: callers attach per-session data (resource_usage) to the result
+        metrics = dict(_static_machine_metrics())
 
         if gpu_usage is not None:
             metrics["gpu_usage_percent"] = gpu_usage
@@ -102,43 +157,123 @@ def get_machine_metrics() -> Dict[str, Any]:
         }
 
 
-def track_resources(session_data: Dict, interval: int = 10):
-    """Track system resources in a separate thread."""
-    while not getattr(threading.current_thread(), "stop", False):
-        try:
-            cpu_usage = psutil.cpu_percent()
-            ram_usage = psutil.virtual_memory().percent
-            disk_usage = psutil.disk_usage("/").percent
-            gpu_usage = get_gpu_usage()
-
-            resource_metrics = {
-                "time": time.time(),
-                "cpu_usage_percent": cpu_usage,
-                "ram_usage_percent": ram_usage,
-                "disk_usage_percent": disk_usage,
-            }
+# Disk fill level changes slowly; stat the filesystem at most once per interval
+# (process-wide, so concurrent sessions share the reading)
+_DISK_MIN_INTERVAL_S = 60.0
+_last_disk: Optional[tuple] = None  # (monotonic time, percent)
+
+
+def _sample_system() -> tuple:
+    """One system snapshot: (cpu %, ram %, disk %)."""
+    global _last_disk
+    # non-blocking: utilisation since the previous sample
+    cpu_usage = psutil.cpu_percent(interval=None)
+    ram_usage = psutil.virtual_memory().percent
+    now = time.monotonic()
+    cached = _last_disk
+    if cached is None or now - cached[0] >= _DISK_MIN_INTERVAL_S:
+        cached = _last_disk = (now, psutil.disk_usage("/").percent)
+    return cpu_usage, ram_usage, cached[1]
+
+
+# Trackers buffer raw sample tuples and publish them to session_data in bulk
+# every N samples (and when stopped), keeping dict building off most ticks
+_RESOURCE_PUBLISH_EVERY = 6
+
+
+def _take_resource_sample() -> tuple:
+    """One raw sample: (time, cpu %, ram %, disk %, gpu %)."""
+    cpu_usage, ram_usage, disk_usage = _sample_system()
+    return time.time(), cpu_usage, ram_usage, disk_usage, get_gpu_usage()
+
+
+def _publish_resource_samples(session_data: Dict, pending: List[tuple]) -> None:
+    """Convert buffered sample tuples to dicts and append them to session_data in one go."""
+    if not pending:
+        return
+    out = []
+    for t, cpu_usage, ram_usage, disk_usage, gpu_usage in pending:
+        resource_metrics = {
+            "time": t,
+            "cpu_usage_percent": cpu_usage,
+            "ram_usage_percent": ram_usage,
+            "disk_usage_percent": disk_usage,
+        }
+        if gpu_usage is not None:
+            resource_metrics["gpu_usage_percent"] = gpu_usage
+        out.append(resource_metrics)
+
+        # OPTIONAL: emit periodic resource events (kept off by default to reduce noise)
+        # log_event(session_data, "resource_sample", actor="system", payload=resource_metrics)
+
+    session_data["machine_metrics"].setdefault("resource_usage", []).extend(out)
+    pending.clear()
+
+
+def _poll_once(session_data: Dict, pending: List[tuple]) -> None:
+    try:
+        pending.append(_take_resource_sample())
+        if len(pending) >= _RESOURCE_PUBLISH_EVERY:
+            _publish_resource_samples(session_data, pending)
+    except Exception as e:
+        logger.error(f"Error tracking resources: {e}")
 
-            if gpu_usage is not None:
-                resource_metrics["gpu_usage_percent"] = gpu_usage
 
-            session_data["machine_metrics"].setdefault("resource_usage", []).append(resource_metrics)
+async def _track_resources_async(session_data: Dict, interval: int = 10):
+    """Track system resources for one session on the shared poller loop until cancelled."""
+    loop = asyncio.get_running_loop()
+    pending: List[tuple] = []
+    # Samples land on a fixed monotonic grid (start + k*interval), so sampling
+    # cost and scheduler jitter do not accumulate into drift
+    deadline = loop.time()
+    try:
+        while True:
+            deadline += interval
+            _poll_once(session_data, pending)
+
+            delay = deadline - loop.time()
+            if delay < -interval:
+                # fell more than a period behind (e.g. suspend): skip missed ticks
+                deadline = loop.time()
+            await asyncio.sleep(max(delay, 0))
+    finally:
+        _publish_resource_samples(session_data, pending)
+
 
-            # OPTIONAL: emit periodic resource events (kept off by default to reduce noise)
-            # log_event(session_data, "resource_sample", actor="system", payload=resource_metrics)
+# One event-loop thread polls resources for every active session
+_poller_loop: Optional[asyncio.AbstractEventLoop] = None
+_poller_lock = threading.Lock()
 
-            time.sleep(interval)
 
-        except Exception as e:
-            logger.error(f"Error tracking resources: {e}")
-            time.sleep(interval)
+def _get_poller_loop() -> asyncio.AbstractEventLoop:
+    global _poller_loop
+    with _poller_lock:
+        if _poller_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="haic-resource-poller", daemon=True).start()
+            _poller_loop = loop
+        return _poller_loop
+
+
+def _stop_poller_task(future, timeout: float = 5.0) -> None:
+    """Cancel a poller task and wait until its cleanup (final publish) has run."""
+    future.cancel()
+    # The cancellation is delivered on the loop before this no-op completes
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), _get_poller_loop()).result(timeout)
 
 
 # -------------------------
 # HAIC event logging
 # -------------------------
+# Group-commit writer shared by every session's JSONL event file
+_EVENT_WRITER = EventWriter()
+
+
 def _ensure_event_structures(session_data: Dict):
     """Ensure required event structures exist in session_data."""
-    session_data.setdefault("events", [])
+    if "events" not in session_data:
+        # deque: O(1) appends without list regrowth; max_events keeps only the most recent
+        session_data["events"] = collections.deque(maxlen=session_data.get("max_events"))
     session_data.setdefault("event_seq", 0)
 
     # Where we write event streams (JSONL) per run
@@ -147,16 +282,28 @@ def _ensure_event_structures(session_data: Dict):
         session_data.setdefault("events_file", str(LOG_DIR / f"run_{run_id}.jsonl"))
 
 
+def _build_event_context(session_data: Dict) -> Dict[str, Any]:
+    rm = session_data.get("run_metadata", {})
+    application = rm.get("application", {})
+    ai_system = rm.get("ai_system", {})
+    return {
+        "run_id": rm.get("run_id"),
+        "session_id": session_data.get("session_id"),
+        "pilot_tag": rm.get("pilot_tag", DEFAULT_PILOT_TAG),
+        "app_version": application.get("version", DEFAULT_APP_VERSION),
+        "app_mode": application.get("mode"),
+        "model_name": ai_system.get("model_name"),
+        "model_version": ai_system.get("model_version"),
+    }
+
+
 def _append_event_to_jsonl(session_data: Dict, event: Dict):
-    """Append an event to the run JSONL file."""
+    """Queue an event for the run JSONL file (encoded and written by the background writer)."""
     events_file = session_data.get("events_file")
     if not events_file:
         return
     try:
-        p = Path(events_file)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with open(p, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event, default=str) + "\n")
+        _EVENT_WRITER.submit(events_file, event)
     except Exception as e:
         logger.error(f"Failed to append event to JSONL: {e}")
 
@@ -176,38 +323,52 @@ def log_event(
       - event_id, event_type, t, seq, actor
       - context: run_id, session_id, pilot_tag, app_version, model_version
       - payload: event-specific data
+
+    If session_data["event_filter"] is set, only those event types are logged.
     """
+    flt = session_data.get("event_filter")
+    if flt is not None and event_type not in flt:
+        return
+
     try:
         _ensure_event_structures(session_data)
         payload = payload or {}
         context_overrides = context_overrides or {}
-        t = t if t is not None else time.time()
+        # t_ns is exact (integer nanoseconds) for ordering; t stays epoch seconds
+        # because metrics/windowing read it as such
+        if t is None:
+            t_ns = _now_ns()
+            t = t_ns / 1e9
+        else:
+            t_ns = round(t * 1e6) * 1000  # a float epoch only carries ~µs precision
 
         session_data["event_seq"] += 1
         seq = session_data["event_seq"]
 
-        rm = session_data.get("run_metadata", {})
-        context = {
-            "run_id": rm.get("run_id"),
-            "session_id": session_data.get("session_id"),
-            "pilot_tag": rm.get("pilot_tag", DEFAULT_PILOT_TAG),
-            "app_version": rm.get("application", {}).get("version", DEFAULT_APP_VERSION),
-            "app_mode": rm.get("application", {}).get("mode"),
-            "model_name": rm.get("ai_system", {}).get("model_name"),
-            "model_version": rm.get("ai_system", {}).get("model_version"),
-        }
-        context.update(context_overrides)
+        # Session context is fixed for the run: built once and cached; each event
+        # gets its own copy, so editing one event's context cannot alter others
+        context = session_data.get("_ctx_template")
+        if context is None:
+            context = session_data["_ctx_template"] = _build_event_context(session_data)
+        if context_overrides:
+            context = {**context, **context_overrides}
+        else:
+            context = dict(context)
 
         event = {
             "event_id": get_event_id(),
             "event_type": event_type,
             "t": t,
+            "t_ns": t_ns,
             "seq": seq,
             "actor": actor,  # "human" | "ai" | "system"
             "context": context,
             "payload": payload,
         }
 
+        if session_data.get("event_store") == "json":
+            # serialize once: the same string is kept in memory and written out
+            event = json.dumps(event, default=str)
         session_data["events"].append(event)
         _append_event_to_jsonl(session_data, event)
 
@@ -215,6 +376,24 @@ def log_event(
         logger.error(f"Failed to log event {event_type}: {e}")
 
 
+# Session started most recently in the current thread/asyncio task context
+_current_session: "contextvars.ContextVar[Dict]" = contextvars.ContextVar("_haic_session")
+
+
+def current_session() -> Optional[Dict]:
+    """Return the session_data started in this context, if any."""
+    return _current_session.get(None)
+
+
+def log_current_event(event_type: str, **kwargs):
+    """log_event() for the current context's session (see current_session())."""
+    session_data = _current_session.get(None)
+    if session_data is None:
+        logger.error(f"Failed to log event {event_type}: no active session in this context")
+        return
+    log_event(session_data, event_type, **kwargs)
+
+
 def start_session_tracking(
     radiologist_id: Optional[str] = None,
     pilot_tag: str = DEFAULT_PILOT_TAG,
@@ -224,11 +403,20 @@ def start_session_tracking(
     model_version: str = "v0",
     inference_config: Optional[Dict[str, Any]] = None,
     dataset: str = "ChestXray14",
+    max_events: Optional[int] = None,
+    event_filter: Optional[Iterable[str]] = None,
+    event_store: str = "dict",
 ) -> Dict:
     """
     Start tracking a new annotation session.
 
     Phase B: creates run_metadata and emits session_start event.
+    max_events bounds the in-memory event buffer to the most recent N events
+    (the JSONL stream always receives all of them); None keeps everything.
+    event_filter restricts logging to the given event types; None logs all.
+    event_store="json" keeps events in memory as encoded JSON strings (encoded
+    once, shared with the JSONL writer, smaller than dicts); exports splice them
+    in verbatim. The default "dict" keeps event dicts.
     """
     try:
         session_id = get_session_id()
@@ -278,20 +466,24 @@ def start_session_tracking(
             "radiologist_id": radiologist_id,
             "machine_metrics": machine_metrics,
             "images": [],       # legacy / backward compatible
-            "events": [],       # Phase B
+            "events": collections.deque(maxlen=max_events),  # Phase B
+            "max_events": max_events,
+            "event_filter": frozenset(event_filter) if event_filter is not None else None,
+            "event_store": event_store,
             "event_seq": 0,     # Phase B
             "events_file": str(LOG_DIR / f"run_{run_id}.jsonl"),
         }
+        session_data["_ctx_template"] = _build_event_context(session_data)
+        _current_session.set(session_data)
 
         # Start database session (summary-level persistence)
         db = get_database()
         db.start_session(session_id, radiologist_id, machine_metrics)
 
-        # Start resource tracking thread
-        metrics_thread = threading.Thread(target=track_resources, args=(session_data,))
-        metrics_thread.daemon = True
-        metrics_thread.start()
-        session_data["_metrics_thread"] = metrics_thread
+        # Start resource tracking on the shared poller loop
+        session_data["_metrics_future"] = asyncio.run_coroutine_threadsafe(
+            _track_resources_async(session_data), _get_poller_loop()
+        )
 
         logger.info(f"Started session tracking: {session_id}")
 
@@ -493,11 +685,18 @@ def end_session_tracking(session_data: Dict):
             payload={"session_end_time": session_data["session_end_time"]},
         )
 
-        # Stop resource tracking thread
-        metrics_thread = session_data.get("_metrics_thread")
-        if metrics_thread and metrics_thread.is_alive():
-            setattr(metrics_thread, "stop", True)
-            metrics_thread.join(timeout=5)
+        # Write out and close the run's event stream
+        events_file = session_data.get("events_file")
+        if events_file:
+            _EVENT_WRITER.flush(events_file, close=True)
+
+        # Stop resource tracking
+        metrics_future = session_data.get("_metrics_future")
+        if metrics_future is not None:
+            _stop_poller_task(metrics_future)
+
+        if _current_session.get(None) is session_data:
+            _current_session.set(None)
 
         # Update database session
         db = get_database()
@@ -509,25 +708,30 @@ def end_session_tracking(session_data: Dict):
         logger.error(f"Failed to end session tracking: {e}")
 
 
-def save_logs(session_data: Dict, filename: Optional[str] = None):
-    """Save session logs (legacy function for backward compatibility)."""
+def save_logs(session_data: Dict, filename: Optional[str] = None, pretty: bool = False):
+    """Save session logs (legacy function for backward compatibility).
+
+    Output is compact JSON; pass pretty=True for an indented, human-readable file.
+    """
     try:
         if filename is None:
             log_file = LOG_DIR / f"session_{session_data['session_id']}.json"
         else:
             log_file = Path(filename)
 
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # JSON-safe copy
+        # JSON-safe copy (non-JSON values are written as str())
         safe = dict(session_data)
-        safe.pop("_metrics_thread", None)
-
-        def default(o):
-            return str(o)
-
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(safe, f, indent=4, default=default)
+        safe.pop("_metrics_future", None)
+        safe.pop("_ctx_template", None)
+        for key in ("events", "decisions"):
+            if isinstance(safe.get(key), collections.deque):
+                safe[key] = list(safe[key])
+        if safe.get("events") and isinstance(safe["events"][0], str):
+            safe["events"] = [loads(e) for e in safe["events"]]
+        if safe.get("event_filter") is not None:
+            safe["event_filter"] = sorted(safe["event_filter"])
+
+        write_json(log_file, safe, pretty=pretty)
 
         logger.info(f"Saved session logs to: {log_file}")
 
@@ -537,7 +741,9 @@ def save_logs(session_data: Dict, filename: Optional[str] = None):
 DECISION_SCHEMA_VERSION = "manufacturing.decisions.v1"  # keep name; reuse across pilots
 
 def _ensure_decisions(session_data: Dict):
-    session_data.setdefault("decisions", [])
+    if "decisions" not in session_data:
+        # unbounded: decisions are the metrics input contract
+        session_data["decisions"] = collections.deque()
     session_data.setdefault("decision_seq", 0)
 
 def log_decision(
@@ -584,12 +790,28 @@ def log_decision(
         logger.error(f"Failed to log decision {action}: {e}")
 
 
-def export_haic_decisions_artifact(session_data: Dict, filename: Optional[str] = None) -> Path:
+def _write_artifact(out: Path, artifact: Dict, pretty: bool) -> None:
+    """
+    Write an export, streaming its "events" array (emitted last) one event at
+    a time, so the encoded session never has to exist in memory as a whole.
+    Pre-serialized events (event_store="json") are copied verbatim.
+    """
+    events = artifact.get("events")
+    if not events:
+        write_json(out, artifact, pretty=pretty)
+        return
+    rest = {k: v for k, v in artifact.items() if k != "events"}
+    items = (e.encode("utf-8") if type(e) is str else dumps(e) for e in events)
+    write_json_with_raw_array(out, rest, "events", items, pretty=pretty)
+
+
+def export_haic_decisions_artifact(session_data: Dict, filename: Optional[str] = None, pretty: bool = False) -> Path:
     """
     Export a single JSON artifact in the Manufacturing-style contract:
       {session_id, meta, decisions[]}
 
     This is the file you upload to MinIO and register in HAIC.
+    Output is compact JSON for machine ingestion; pretty=True indents it.
     """
     run_md = session_data.get("run_metadata", {})
     run_id = run_md.get("run_id", session_data.get("session_id"))
@@ -610,9 +832,9 @@ def export_haic_decisions_artifact(session_data: Dict, filename: Optional[str] =
             "infrastructure": session_data.get("machine_metrics"),
             "timestamps": run_md.get("timestamps", {}),
         },
-        "decisions": session_data.get("decisions", []),
+        "decisions": list(session_data.get("decisions", ())),
         # keep raw events too (optional, but handy for debugging)
-        "events": session_data.get("events", []),
+        "events": list(session_data.get("events", ())),
     }
 
     if filename is None:
@@ -620,14 +842,12 @@ def export_haic_decisions_artifact(session_data: Dict, filename: Optional[str] =
     else:
         out = Path(filename)
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump(artifact, f, indent=2, default=str)
+    _write_artifact(out, artifact, pretty)
 
     logger.info(f"Exported HAIC decisions artifact to: {out}")
     return out
 
-def export_haic_artifact(session_data: Dict, filename: Optional[str] = None) -> Path:
+def export_haic_artifact(session_data: Dict, filename: Optional[str] = None, pretty: bool = False) -> Path:
     """
     Export a single HAIC-ready artifact JSON for import into the HAIC platform.
 
@@ -638,6 +858,8 @@ def export_haic_artifact(session_data: Dict, filename: Optional[str] = None) ->
       - retraining (optional)
       - machine_metrics (optional)
 
+    Output is compact JSON for machine ingestion; pretty=True indents it.
+
     Returns the path of the exported artifact.
     """
     try:
@@ -651,17 +873,22 @@ def export_haic_artifact(session_data: Dict, filename: Optional[str] = None) ->
         if not events:
             events = []
             events_file = session_data.get("events_file")
+            if events_file:
+                _EVENT_WRITER.flush(events_file)
             if events_file and Path(events_file).exists():
-                with open(events_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            events.append(json.loads(line))
-                        except Exception:
-                            # tolerate partially written lines
-                            continue
+                with open(events_file, "rb") as f:
+                    # mmap: lines are sliced from the page cache, no read buffer copies
+                    if os.fstat(f.fileno()).st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            for line in iter(mm.readline, b""):
+                                line = line.strip()
+                                if not line:
+                                    continue
+                                try:
+                                    events.append(loads(line))
+                                except Exception:
+                                    # tolerate partially written lines
+                                    continue
 
         # Build artifact
         artifact = {
@@ -671,7 +898,7 @@ def export_haic_artifact(session_data: Dict, filename: Optional[str] = None) ->
             "session_id": session_id,
             "pilot_tag": run_md.get("pilot_tag"),
             "run_metadata": run_md,
-            "events": events,
+            "events": list(events),
             # keep backward-compat info (handy for debugging / legacy imports)
             "images": session_data.get("images", []),
             "retraining": session_data.get("retraining"),
@@ -684,15 +911,7 @@ def export_haic_artifact(session_data: Dict, filename: Optional[str] = None) ->
         else:
             out_path = Path(filename)
 
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Make JSON-safe copy
-        safe = dict(artifact)
-        def default(o):
-            return str(o)
-
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(safe, f, indent=2, default=default)
+        _write_artifact(out_path, artifact, pretty)
 
         logger.info(f"Exported HAIC artifact to: {out_path}")
         return out_path
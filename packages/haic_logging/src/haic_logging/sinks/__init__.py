@@ -1,4 +1,6 @@
-from .jsonl import append_jsonl
-from .json import write_json
+from .encoding import dumps, loads
+from .event_writer import EventWriter
+from .jsonl import append_bytes, append_jsonl, iter_jsonl_lines, open_append_fd, write_fd, write_fd_vectored
+from .json import write_json, write_json_with_jsonl, write_json_with_raw_array
 
-__all__ = ["append_jsonl", "write_json"]
+__all__ = ["EventWriter", "append_bytes", "append_jsonl", "dumps", "iter_jsonl_lines", "loads", "open_append_fd", "write_fd", "write_fd_vectored", "write_json", "write_json_with_jsonl", "write_json_with_raw_array"]
@@ -0,0 +1,81 @@
+import datetime as _dt
+import json
+import math
+from typing import Any
+
+# Make orjson / msgspec optional (no hard dependency); orjson is preferred
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # type: ignore
+except ImportError:
+    msgspec = None
+
+
+def _default(o: Any) -> Any:
+    # Mirror orjson's native handling where cheap: ISO datetimes, numpy via tolist()
+    if isinstance(o, (_dt.datetime, _dt.date, _dt.time)):
+        return o.isoformat()
+    tolist = getattr(o, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    return str(o)
+
+
+def _finite(o: Any) -> Any:
+    # NaN/Infinity -> None through dicts and lists, as orjson/msgspec write them
+    if isinstance(o, float):
+        return o if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {k: _finite(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_finite(v) for v in o]
+    return o
+
+
+def _finite_default(o: Any) -> Any:
+    return _finite(_default(o))
+
+
+def _json_dumps(obj: Any, **kw: Any) -> str:
+    try:
+        return json.dumps(obj, allow_nan=False, ensure_ascii=False, default=_default, **kw)
+    except ValueError:
+        # rare: a non-finite float somewhere; rewrite it as null rather than NaN/Infinity
+        return json.dumps(_finite(obj), allow_nan=False, ensure_ascii=False, default=_finite_default, **kw)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+
+    Uses orjson or msgspec when installed; the stdlib fallback emits the same
+    compact (or 2-space indented) layout, and like them writes non-finite floats
+    (NaN, Infinity) as null, so sink output does not depend on the backend.
+    """
+    if orjson is not None:
+        # UUID/datetime are native; numpy arrays/scalars serialize without tolist()
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    if msgspec is not None:
+        data = msgspec.json.encode(obj, enc_hook=_default)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    if indent:
+        return _json_dumps(obj, indent=2).encode("utf-8")
+    return _json_dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes/str with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
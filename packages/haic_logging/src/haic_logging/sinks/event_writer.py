@@ -0,0 +1,124 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .jsonl import open_append_fd, write_fd
+
+logger = logging.getLogger(__name__)
+
+_FSYNC_INTERVAL_S = 1.0
+
+
+class EventWriter:
+    """
+    Group-commit writer for the per-run JSONL event files.
+
+    Callers only enqueue event dicts; a daemon thread drains everything queued
+    so far, JSON-encodes it and appends each file's lines with a single
+    os.write() on a persistent O_APPEND fd (no Python io buffering). Files stay
+    open until closed via flush(..., close=True) or at interpreter exit.
+    """
+
+    def __init__(self) -> None:
+        self._q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._fds: Dict[str, int] = {}  # one O_APPEND fd per open run file
+        self._last_fsync = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="haic-event-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+                atexit.register(self.shutdown)
+
+    def submit(self, path: str, event: Any) -> None:
+        """Queue an event dict, or its already-encoded JSON string."""
+        self._ensure_started()
+        self._q.put((path, event))
+
+    def flush(self, path: Optional[str] = None, close: bool = False, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted so far is written; close path (None: all files) if asked."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._q.put((path, (close, done)))
+        done.wait(timeout)
+
+    def shutdown(self) -> None:
+        self.flush(None, close=True, timeout=5)
+
+    def _run(self) -> None:
+        q = self._q
+        while True:
+            items = [q.get()]
+            try:
+                while True:
+                    items.append(q.get_nowait())
+            except queue.Empty:
+                pass
+
+            pending: Dict[str, List[Dict[str, Any]]] = {}
+            for path, data in items:
+                if isinstance(data, (dict, str)):
+                    pending.setdefault(path, []).append(data)
+                    continue
+                # control item: everything queued before it goes out first
+                self._write(pending)
+                pending = {}
+                close, done = data
+                if close:
+                    self._close(path)
+                done.set()
+            self._write(pending)
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        if not pending:
+            return
+        sync = time.monotonic() - self._last_fsync >= _FSYNC_INTERVAL_S
+        for path, events in pending.items():
+            lines = []
+            for e in events:
+                if type(e) is not str:
+                    # encoded here, off the caller's thread: one bad event (circular
+                    # payload, dict mutated meanwhile) is dropped, not its whole batch
+                    try:
+                        e = json.dumps(e, default=str)
+                    except Exception as exc:
+                        logger.error(f"Failed to encode event for JSONL {path}: {exc}")
+                        continue
+                lines.append(e + "\n")
+            if not lines:
+                continue
+            try:
+                data = "".join(lines).encode("utf-8")
+                fd = self._fds.get(path)
+                if fd is None:
+                    fd = self._fds[path] = open_append_fd(Path(path))
+                write_fd(fd, data, sync=sync)
+            except Exception as e:
+                logger.error(f"Failed to append events to JSONL {path}: {e}")
+        if sync:
+            self._last_fsync = time.monotonic()
+
+    def _close(self, path: Optional[str]) -> None:
+        paths = list(self._fds) if path is None else [path]
+        for p in paths:
+            fd = self._fds.pop(p, None)
+            if fd is None:
+                continue
+            try:
+                os.fsync(fd)
+                os.close(fd)
+            except Exception as e:
+                logger.error(f"Failed to close JSONL {p}: {e}")
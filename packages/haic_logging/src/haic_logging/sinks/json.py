@@ -1,8 +1,41 @@
-import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
-def write_json(path: Path, obj: Dict[str, Any]) -> None:
+from .encoding import dumps
+from .jsonl import iter_jsonl_lines
+
+def write_json(path: Path, obj: Dict[str, Any], *, pretty: bool = True) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, default=str)
+    # encode fully in memory, then one write
+    path.write_bytes(dumps(obj, indent=pretty))
+
+
+def write_json_with_raw_array(
+    path: Path, obj: Dict[str, Any], key: str, items: Iterable[bytes], *, pretty: bool = True
+) -> None:
+    """
+    Write obj like write_json, plus a trailing top-level array `key` whose items
+    are already-encoded JSON values, copied verbatim (no parse/re-encode round
+    trip, and items can be streamed instead of held in memory).
+    """
+    head = dumps(obj, indent=pretty).rstrip()
+    head = head[:-1].rstrip()  # drop the closing brace
+    sep = b"," if head != b"{" else b""
+    if pretty:
+        open_arr, item_sep, close_empty, close = b"\n  " + dumps(key) + b": [", b"\n    ", b"]\n}", b"\n  ]\n}"
+    else:
+        open_arr, item_sep, close_empty, close = dumps(key) + b":[", b"", b"]}", b"]}"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as out:
+        out.write(head + sep + open_arr)
+        first = True
+        for item in items:
+            out.write((item_sep if first else b"," + item_sep) + item)
+            first = False
+        out.write(close_empty if first else close)
+
+
+def write_json_with_jsonl(path: Path, obj: Dict[str, Any], key: str, jsonl_path: Path, *, pretty: bool = True) -> None:
+    """write_json_with_raw_array with the lines of jsonl_path (plain or .gz) as the items."""
+    write_json_with_raw_array(path, obj, key, iter_jsonl_lines(jsonl_path), pretty=pretty)
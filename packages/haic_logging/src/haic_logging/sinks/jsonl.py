@@ -1,8 +1,111 @@
-import json
+import os
+import zlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List
+
+from .encoding import dumps
 
 def append_jsonl(path: Path, obj: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, default=str) + "\n")
+    with path.open("ab") as f:
+        f.write(dumps(obj) + b"\n")
+
+
+def append_bytes(path: Path, data: bytes, *, sync: bool = False) -> None:
+    """Append pre-serialized JSONL lines; optionally fsync before returning."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def open_append_fd(path: Path) -> int:
+    """Open path for appending and return a raw file descriptor kept by the caller."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+    return os.open(path, flags, 0o644)
+
+
+def write_fd(fd: int, data: bytes, *, sync: bool = False) -> None:
+    """Write all of data to fd (retrying short writes); optionally sync to disk."""
+    view = memoryview(data)
+    while view:
+        n = os.write(fd, view)
+        view = view[n:]
+    if sync:
+        getattr(os, "fdatasync", os.fsync)(fd)
+
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+def write_fd_vectored(fd: int, bufs: List[bytes], *, sync: bool = False) -> None:
+    """
+    Write bufs to fd back to back without concatenating them first.
+
+    Uses os.writev (one syscall per IOV_MAX buffers, retrying short writes);
+    falls back to a single joined write where writev is unavailable (Windows).
+    """
+    if not hasattr(os, "writev"):
+        write_fd(fd, b"".join(bufs), sync=sync)
+        return
+    pending: List[Any] = list(bufs)
+    i = 0
+    while i < len(pending):
+        n = os.writev(fd, pending[i:i + _IOV_MAX])
+        while n:
+            head = pending[i]
+            if n >= len(head):
+                n -= len(head)
+                i += 1
+            else:
+                pending[i] = memoryview(head)[n:]
+                n = 0
+        # skip empty buffers so the loop always makes progress
+        while i < len(pending) and not pending[i]:
+            i += 1
+    if sync:
+        getattr(os, "fdatasync", os.fsync)(fd)
+
+
+def iter_jsonl_lines(path: Path, *, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Yield the non-empty raw lines of a JSONL file, without trailing newlines.
+
+    Files ending in ".gz" are decompressed incrementally. Concatenated gzip
+    members are supported, and so is a stream that is still being written
+    (no gzip trailer yet): everything up to the last flush is returned.
+    """
+    if not path.exists():
+        return
+    gz = path.suffix == ".gz"
+    d = zlib.decompressobj(wbits=31) if gz else None
+    carry = b""
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if d is not None:
+                data = d.decompress(chunk)
+                while d.eof and d.unused_data:
+                    rest = d.unused_data
+                    d = zlib.decompressobj(wbits=31)
+                    data += d.decompress(rest)
+                chunk = data
+            lines = (carry + chunk).split(b"\n")
+            carry = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line
+    carry = carry.strip()
+    if carry:
+        yield carry
@@ -0,0 +1,144 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from haic_logging import HaicLogger
+
+
+def _read_events(path: Path):
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_events_are_buffered_until_close(tmp_path: Path):
+    hl = HaicLogger(log_dir=tmp_path, flush_interval_ms=0)
+    hl.log_event(event_type="task_item_loaded", payload={"task_item_id": "img_1"})
+
+    # The stream is opened up front, but nothing hits the disk before a flush trigger
+    assert hl.events_path.stat().st_size == 0
+
+    hl.close()
+    events = _read_events(hl.events_path)
+    assert [e["event_type"] for e in events] == ["session_start", "task_item_loaded", "session_end"]
+    assert [e["seq"] for e in events] == [1, 2, 3]
+
+
+def test_event_context_follows_model_version_updates(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path, model_version="v0") as hl:
+        before = hl.log_event(event_type="ai_suggestion_presented")
+        hl.model_version = "v1"
+        after = hl.log_event(event_type="ai_suggestion_presented", context_overrides={"case": "c1"})
+
+    assert before["context"]["model_version"] == "v0"
+    assert after["context"]["model_version"] == "v1"
+    assert after["context"]["case"] == "c1"
+
+
+def test_artifact_events_match_stream_with_and_without_retention(tmp_path: Path):
+    exported = {}
+    for retain in (False, True):
+        with HaicLogger(log_dir=tmp_path / str(retain), retain_events=retain) as hl:
+            hl.log_event(event_type="human_decision", actor="human", payload={"decision": "accept"})
+            hl.log_decision(actor_type="human", action="accept", object_id="img_1", duration_s=1.5)
+            out = hl.export_decisions_artifact()
+        with out.open("r", encoding="utf-8") as f:
+            exported[retain] = json.load(f)
+
+    for artifact in exported.values():
+        assert [e["event_type"] for e in artifact["events"]] == ["session_start", "human_decision"]
+        assert artifact["decisions"][0]["action"] == "accept"
+    assert exported[False].keys() == exported[True].keys()
+
+
+def test_compressed_stream_is_gzip_and_exports(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path, compress=True, flush_interval_ms=0) as hl:
+        hl.log_event(event_type="task_item_loaded", payload={"task_item_id": "img_1"})
+        out = hl.export_decisions_artifact()  # reads the stream before the gzip trailer exists
+
+    assert hl.events_path.name.endswith(".jsonl.gz")
+    with gzip.open(hl.events_path, "rt", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    assert [e["event_type"] for e in events] == ["session_start", "task_item_loaded", "session_end"]
+
+    with out.open("r", encoding="utf-8") as f:
+        artifact = json.load(f)
+    assert [e["event_type"] for e in artifact["events"]] == ["session_start", "task_item_loaded"]
+
+
+def test_bounded_write_queue_blocks_instead_of_losing_events(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path, write_queue_size=2, flush_interval_ms=1) as hl:
+        for i in range(200):
+            hl.log_event(event_type="task_item_loaded", payload={"i": i})
+
+    assert hl.dropped_events == 0
+    events = _read_events(hl.events_path)
+    assert [e["seq"] for e in events] == list(range(1, 203))
+
+
+def test_unknown_write_queue_policy_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        HaicLogger(log_dir=tmp_path, write_queue_policy="spill")
+
+
+def test_commit_makes_queued_events_readable(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path, flush_interval_ms=0) as hl:
+        hl.log_event(event_type="task_item_loaded")
+        assert hl.events_path.stat().st_size == 0
+        hl.commit()
+        assert [e["seq"] for e in _read_events(hl.events_path)] == [1, 2]
+
+        hl.log_event(event_type="human_decision", actor="human", durable=True)
+        assert len(_read_events(hl.events_path)) == 3
+
+
+def test_events_carry_integer_nanosecond_timestamps(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path) as hl:
+        live = hl.log_event(event_type="task_item_loaded")
+        given = hl.log_event(event_type="task_item_loaded", t=1700000000.25)
+
+    assert isinstance(live["t_ns"], int)
+    assert abs(live["t"] - live["t_ns"] / 1e9) < 1e-6
+    assert given["t_ns"] == 1700000000250000000
+
+
+def test_stdlib_encoder_writes_non_finite_floats_as_null(monkeypatch):
+    from haic_logging.sinks import encoding
+
+    monkeypatch.setattr(encoding, "orjson", None)
+    monkeypatch.setattr(encoding, "msgspec", None)
+    obj = {"t": 1.0, "duration_s": float("nan"), "xs": [float("inf"), {"y": float("-inf")}]}
+    assert json.loads(encoding.dumps(obj)) == {"t": 1.0, "duration_s": None, "xs": [None, {"y": None}]}
+
+
+def test_editing_a_returned_event_does_not_leak_into_later_events(tmp_path: Path):
+    with HaicLogger(log_dir=tmp_path) as hl:
+        ev = hl.log_event(event_type="a")
+        ev["context"]["annotated"] = True
+        hl.log_event(event_type="b")
+
+    events = _read_events(hl.events_path)
+    assert [e["event_type"] for e in events] == ["session_start", "a", "b", "session_end"]
+    assert all("annotated" not in e["context"] for e in events)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_queued_events_are_written_when_the_program_exits_without_close(tmp_path: Path, compress: bool):
+    import subprocess
+    import sys
+
+    code = (
+        "from haic_logging import HaicLogger\n"
+        f"hl = HaicLogger(log_dir={str(tmp_path)!r}, compress={compress})\n"
+        "for i in range(5000):\n"
+        "    hl.log_event(event_type='task_item_loaded', payload={'i': i})\n"
+        "print(hl.events_path)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    data = Path(out.strip()).read_bytes()
+    if compress:
+        data = gzip.decompress(data)  # raises if the gzip trailer is missing
+    events = [json.loads(line) for line in data.splitlines()]
+    assert len(events) == 5002
+    assert events[-1]["event_type"] == "session_end"
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+from haic_logging.sinks import EventWriter
+
+
+def _read(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_writer_appends_queued_events_in_order(tmp_path: Path):
+    a, b = tmp_path / "run_a.jsonl", tmp_path / "run_b.jsonl"
+    w = EventWriter()
+    for i in range(100):
+        w.submit(str(a), {"seq": i})
+    w.submit(str(b), json.dumps({"seq": 0}))  # pre-encoded events are written as-is
+    w.flush(str(a), close=True)
+
+    assert [e["seq"] for e in _read(a)] == list(range(100))
+    assert str(a) not in w._fds and str(b) in w._fds
+
+    # a closed file is reopened (appending) on the next submit
+    w.submit(str(a), {"seq": 100})
+    w.shutdown()
+    assert [e["seq"] for e in _read(a)] == list(range(101))
+    assert _read(b) == [{"seq": 0}]
+    assert not w._fds
+
+
+def test_flush_before_any_submit_is_a_no_op(tmp_path: Path):
+    w = EventWriter()
+    w.flush(close=True)
+    assert w._thread is None
+
+
+def test_an_unencodable_event_does_not_drop_its_batch(tmp_path: Path):
+    path = tmp_path / "run.jsonl"
+    circular: dict = {"seq": 1}
+    circular["self"] = circular
+    w = EventWriter()
+    for e in ({"seq": 0}, circular, {"seq": 2}):
+        w.submit(str(path), e)
+    w.flush(str(path), close=True)
+
+    assert [e["seq"] for e in _read(path)] == [0, 2]
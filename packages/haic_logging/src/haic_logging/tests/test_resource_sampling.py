@@ -0,0 +1,29 @@
+import sys
+import time
+
+import psutil
+import pytest
+
+from haic_logging import HaicLogger
+from haic_logging.logger import _LinuxProcSampler
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc sampler is Linux-only")
+def test_proc_sampler_matches_psutil():
+    sampler = _LinuxProcSampler.create()
+    assert sampler is not None
+    try:
+        assert abs(sampler.ram_percent() - psutil.virtual_memory().percent) < 2.0
+        assert 0.0 <= sampler.cpu_percent() <= 100.0
+    finally:
+        sampler.close()
+
+
+def test_resource_samples_are_recorded(tmp_path):
+    with HaicLogger(log_dir=tmp_path, enable_resource_tracking=True, resource_interval_s=0.01) as hl:
+        time.sleep(0.05)
+
+    samples = hl.run_metadata()["infrastructure"]["resource_usage"]
+    assert samples
+    for key in ("t", "t_mono", "cpu_usage_percent", "ram_usage_percent", "disk_usage_percent"):
+        assert key in samples[0]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+JsonDict = Dict[str, Any]
+
+# Values that count as "absent" when resolving an alias (same rule as Metrics._pick)
+_EMPTY = (None, "", [], {})
+_NO_PRIORITY = 1 << 30
+
+def _to_float(x: Any, default: float = 0.0) -> float:
+    # fast paths for the common cases (float(None) would only raise and fall back)
+    if type(x) is float:
+        return x
+    if x is None:
+        return default
+    try:
+        if isinstance(x, bool):
+            return 1.0 if x else 0.0
+        return float(x)
+    except Exception:
+        return default
+
+def _reverse_index(
+    aliases: Dict[str, List[str]],
+    fields: Iterable[str],
+) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+    """
+    alias key -> ((logical field, priority), ...); one alias may feed several fields.
+    Keys are interned, so probes with interned row keys compare by identity.
+    """
+    index: Dict[str, List[Tuple[str, int]]] = {}
+    for field in fields:
+        for priority, alias in enumerate(aliases[field]):
+            index.setdefault(sys.intern(alias), []).append((field, priority))
+    return {alias: tuple(targets) for alias, targets in index.items()}
+
+
+class DecisionsFrame:
+    """
+    Column-per-logical-field view of a decisions batch.
+
+    Each column holds, per row, the value of the highest-priority non-empty alias
+    (None when absent), so metrics reduce over one list instead of re-resolving
+    aliases row by row. Built in a single pass over the rows.
+
+    Only fields that occur in at least one row are stored; the others (typically
+    most of the catalogue) read as all-None columns without being allocated.
+    """
+
+    __slots__ = ("n", "fields", "columns", "_floats")
+
+    def __init__(self, n: int, columns: Dict[str, List[Any]], fields: Optional[Iterable[str]] = None):
+        self.n = n
+        self.fields = tuple(columns if fields is None else fields)
+        self.columns = columns
+        self._floats: Dict[str, List[float]] = {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        decisions: List[JsonDict],
+        *,
+        aliases: Optional[Dict[str, List[str]]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> "DecisionsFrame":
+        """
+        aliases defaults to the outcome catalogue's (Metrics._CFG["aliases"]);
+        fields restricts the frame to the logical fields a caller needs.
+        """
+        index = None
+        if aliases is None:
+            from .outcome_metrics import Metrics  # deferred: outcome_metrics imports this module
+            aliases = Metrics._CFG["aliases"]
+            if fields is None:
+                index = Metrics._ALIAS_INDEX  # prebuilt at class load
+        names = tuple(aliases if fields is None else fields)
+        if index is None:
+            index = _reverse_index(aliases, names)
+
+        n = len(decisions)
+        columns: Dict[str, List[Any]] = {}
+        known = index.keys()
+        for i, row in enumerate(decisions):
+            best: Dict[str, int] = {}
+            # keys-view intersection (in C) leaves only this row's alias keys to visit
+            for key in row.keys() & known:
+                value = row[key]
+                if value in _EMPTY:
+                    continue
+                for name, priority in index[key]:
+                    if priority < best.get(name, _NO_PRIORITY):
+                        best[name] = priority
+                        column = columns.get(name)
+                        if column is None:
+                            column = columns[name] = [None] * n
+                        column[i] = value
+        return cls(n, columns, names)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def col(self, name: str) -> List[Any]:
+        column = self.columns.get(name)
+        if column is not None:
+            return column
+        if name in self.fields:
+            return [None] * self.n  # field no row carries
+        raise KeyError(f"DecisionsFrame has no column {name!r} (built with fields={self.fields})")
+
+    def floats(self, name: str) -> List[float]:
+        """
+        A column as floats, missing/unparseable values as 0.0. Converted on first
+        use and kept, so several metrics reading one column parse it once.
+        """
+        out = self._floats.get(name)
+        if out is None:
+            if name in self.columns:
+                conv = _to_float
+                out = [v if type(v) is float else conv(v, 0.0) for v in self.columns[name]]
+            else:
+                self.col(name)  # KeyError for fields the frame was not built with
+                out = [0.0] * self.n
+            self._floats[name] = out
+        return out
+
+    def sum(self, name: str) -> float:
+        """Sum of a column as floats; missing/unparseable values count as 0.0."""
+        return sum(self.floats(name))
@@ -1,5 +1,9 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Union, Optional, Literal, TypedDict
+from typing import Any, Dict, List, Sequence, Union, Optional, Literal, TypedDict
+from collections import OrderedDict
+import copy
+import hashlib
+import json
 
 from .io import extract_decisions
 from .validators import validate_decisions_minimal
@@ -29,7 +33,19 @@ class WindowSummary(TypedDict, total=False):
     effective: Dict[str, Any]     # computed epoch bounds + relative bounds
     counts: Dict[str, int]        # decisions_total/used, events_total/used
     duration_s: float
-    notes: List[str]              # clamping, missing timestamps, etc.
+    notes: Sequence[str]          # clamping, missing timestamps, etc. (() when none)
+
+
+# Opt-in memo for compute_metrics(use_cache=True), keyed by a content hash of the
+# inputs, so a dashboard re-polling the same artifact skips the recompute
+_RESULT_CACHE_MAX = 128
+_result_cache: "OrderedDict[bytes, JsonDict]" = OrderedDict()
+
+
+def _cache_key(decisions_or_artifact: Any, **params: Any) -> bytes:
+    # content hash rather than id(): callers may mutate and re-submit the same object
+    blob = json.dumps([decisions_or_artifact, params], sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).digest()
 
 
 def compute_metrics(
@@ -40,6 +56,7 @@ def compute_metrics(
     baseline_s: float | None = None,
     include_warnings: bool = True,
     window: Optional[WindowSpec] = None,
+    use_cache: bool = False,
 ) -> JsonDict:
     """
     Profiles:
@@ -51,7 +68,28 @@ def compute_metrics(
       - window={"basis":"relative","last":120}           -> last 120 seconds of session
       - window={"basis":"absolute","start":<epoch>,"end":<epoch>} -> epoch seconds
       - window={"basis":"absolute","start":<iso>,"end":<iso>}     -> ISO timestamps
+
+    use_cache=True memoizes results (last 128 distinct inputs) by content hash;
+    each call gets its own copy of the cached result.
     """
+    if profile not in ("core", "full"):
+        raise ValueError(f"Unknown profile: {profile}")
+
+    key = None
+    if use_cache:
+        key = _cache_key(
+            decisions_or_artifact,
+            profile=profile,
+            rt_max_s=rt_max_s,
+            baseline_s=baseline_s,
+            include_warnings=include_warnings,
+            window=window,
+        )
+        hit = _result_cache.get(key)
+        if hit is not None:
+            _result_cache.move_to_end(key)
+            return copy.deepcopy(hit)
+
     decisions = extract_decisions(decisions_or_artifact)
 
     ok, warnings = validate_decisions_minimal(decisions)
@@ -85,8 +123,6 @@ def compute_metrics(
     # Extended catalogue
     if profile == "full":
         metrics.update(compute_outcome_metrics(decisions_f, profile="core_outcomes"))
-    elif profile != "core":
-        raise ValueError(f"Unknown profile: {profile}")
 
     out: JsonDict = {
         "metrics": metrics,
@@ -96,4 +132,9 @@ def compute_metrics(
     if include_warnings:
         out["warnings"] = warnings
 
+    if key is not None:
+        _result_cache[key] = copy.deepcopy(out)
+        if len(_result_cache) > _RESULT_CACHE_MAX:
+            _result_cache.popitem(last=False)
+
     return out
@@ -1,15 +1,10 @@
 from __future__ import annotations
+from collections import defaultdict
 from typing import Dict, List, Any, Iterable
-import math
 
-def _pctl(xs: List[float], q: float) -> float | None:
-    if not xs: return None
-    xs = sorted(xs)
-    i = (len(xs) - 1) * q
-    lo, hi = int(math.floor(i)), int(math.ceil(i))
-    if lo == hi: return xs[lo]
-    f = i - lo
-    return xs[lo] * (1 - f) + xs[hi] * f
+from .stats import quantile_matrix as _quantile_matrix, summarize as _summarize
+
+_HUMAN_AGENTS = frozenset({"human", "operator", "radiologist"})
 
 def _rt_seconds_from_decision(d: Dict[str, Any]) -> float | None:
     # Prefer explicit seconds if present
@@ -30,7 +25,7 @@ def human_response_percentiles_by(
     Returns Chart.js-friendly payload + human SLA from extras.rt_limits.rt_max_human_s.
     """
     logs = logs_root.get("logs", [])
-    by_group: Dict[str, List[float]] = {}
+    by_group: Dict[str, List[float]] = defaultdict(list)
 
     # Read SLA cap if present
     rt_caps = (logs_root.get("extras", {}) or {}).get("rt_limits", {})
@@ -42,16 +37,11 @@ def human_response_percentiles_by(
             if str(d.get("actor_type", "")).lower() == "human":
                 val = _rt_seconds_from_decision(d)
                 if val is not None:
-                    by_group.setdefault(group, []).append(val)
+                    by_group[group].append(val)
 
     labels = sorted(by_group.keys())
     qs = list(quantiles)
-    matrix = []
-    for q in qs:
-        row = []
-        for g in labels:
-            row.append(_pctl(by_group.get(g, []), q))
-        matrix.append(row)
+    matrix = _quantile_matrix([by_group[g] for g in labels], qs)
 
     return {
         "labels": labels,
@@ -63,6 +53,14 @@ def human_response_percentiles_by(
     }
 
 
+_EMPTY_HUMAN_RT = {
+    "human_rt_n": 0,
+    "human_rt_mean_s": 0.0,
+    "human_rt_p50_s": 0.0,
+    "human_rt_p90_s": 0.0,
+    "human_rt_p95_s": 0.0,
+}
+
 def compute_human_rt_metrics(
     decisions: List[Dict[str, Any]],
     *,
@@ -72,31 +70,28 @@ def compute_human_rt_metrics(
     Human response-time summary from decisions.
     Returns p50/p90/p95/mean/count (seconds).
     """
+    if not decisions:
+        return dict(_EMPTY_HUMAN_RT)
+
     xs: List[float] = []
     for d in decisions:
         # conservative filter: only human decisions
         agent = (d.get("actor_type") or d.get("agent") or d.get("actor") or "").lower()
-        if agent and agent not in ("human", "operator", "radiologist"):
+        if agent and agent not in _HUMAN_AGENTS:
             continue
         rt = _rt_seconds_from_decision(d)
         if rt is not None:
             xs.append(rt)
 
     if not xs:
-        return {
-            "human_rt_n": 0,
-            "human_rt_mean_s": 0.0,
-            "human_rt_p50_s": 0.0,
-            "human_rt_p90_s": 0.0,
-            "human_rt_p95_s": 0.0,
-        }
+        return dict(_EMPTY_HUMAN_RT)
 
-    mean = sum(xs) / len(xs)
-    q50, q90, q95 = quantiles
+    # mean and all three percentiles come from one summary of the sample
+    mean, (p50, p90, p95) = _summarize(xs, quantiles)
     return {
         "human_rt_n": float(len(xs)),
         "human_rt_mean_s": float(mean),
-        "human_rt_p50_s": float(_pctl(xs, q50) or 0.0),
-        "human_rt_p90_s": float(_pctl(xs, q90) or 0.0),
-        "human_rt_p95_s": float(_pctl(xs, q95) or 0.0),
+        "human_rt_p50_s": float(p50),
+        "human_rt_p90_s": float(p90),
+        "human_rt_p95_s": float(p95),
     }
\ No newline at end of file
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional
 import math
+import sys
 import datetime as dt
+from functools import lru_cache
 
 DEFAULT_RT_MAX = 5.0   # seconds
 DEFAULT_BASELINE_S = None
@@ -12,32 +14,61 @@ _PROGRESS_BONUS_WEIGHT = 0.10    # 0..1 bonus multiplier
 
 # -------------------- NEW: schema flexibility helpers --------------------
 _ALIASES = {
-    "agent":        ["agent", "actor_type", "actor", "role"],
-    "timestamp":    ["timestamp", "time", "created_at", "event_time", "date"],
-    "t":            ["t"],
-    "action":       ["action", "event_type", "type", "name"],
-    "interaction":  ["interaction_id", "case_id", "ticket_id", "job_id", "image_id"],
-    "duration_s":   ["duration_s", "human_duration_s", "duration"],
-    "latency_ms":   ["latency_ms", "inference_ms", "latency"],
-    "correct":      ["correct", "agreement", "is_correct"],
+    "agent":        ("agent", "actor_type", "actor", "role"),
+    "timestamp":    ("timestamp", "time", "created_at", "event_time", "date"),
+    "t":            ("t",),
+    "action":       ("action", "event_type", "type", "name"),
+    "interaction":  ("interaction_id", "case_id", "ticket_id", "job_id", "image_id"),
+    "duration_s":   ("duration_s", "human_duration_s", "duration"),
+    "latency_ms":   ("latency_ms", "inference_ms", "latency"),
+    "correct":      ("correct", "agreement", "is_correct"),
 }
 
 _AGENT_MAP = {"human": "HUMAN", "ai": "AI", "system": "SYS"}
 
+# compute_metrics result for an empty batch without an explicit T (EL needs T)
+_ZERO_METRICS = {
+    "F": 0.0, "D": 0.0, "HCL": 0.0, "Tr": 1.0, "A": 0.0, "S": 0.0, "EL": 0.0,
+    "EfficiencyScore": 1.0,
+}
+
+# Values that count as "missing" for alias lookup; built once rather than per call
+_EMPTY = (None, "", [], {})
+
 def _get(d: Dict[str, Any], keys) -> Any:
-    for k in keys:
-        if k in d and d[k] not in (None, "", [], {}):
-            return d[k]
-    return None
+    # a missing key reads as None, which _EMPTY already rejects
+    return next((v for v in map(d.get, keys) if v not in _EMPTY), None)
 
-def _canon_str(x: Optional[str]) -> Optional[str]:
-    if x is None:
-        return None
-    s = str(x).strip().lower().replace("&", "and")
+def _present_aliases(decisions: List[Dict[str, Any]]) -> Dict[str, tuple]:
+    """
+    Per canonical key, the aliases that occur as a column anywhere in the batch
+    (in _ALIASES priority order). Aliases no row carries can never match, so the
+    per-row lookups only walk these.
+    """
+    cols = set().union(*(e.keys() for e in decisions if isinstance(e, dict)))
+    return {canon: tuple(k for k in keys if k in cols) for canon, keys in _ALIASES.items()}
+
+@lru_cache(maxsize=1 << 12)
+def _canon_text(s: str) -> str:
+    s = s.strip().lower().replace("&", "and")
     while "  " in s:
         s = s.replace("  ", " ")
     return s
 
+def _canon_str(x: Optional[str]) -> Optional[str]:
+    if x is None:
+        return None
+    # agent/role labels come from a tiny vocabulary, so the cache hit rate is ~100%
+    return _canon_text(x if type(x) is str else str(x))
+
+@lru_cache(maxsize=1 << 16)
+def _parse_ts_str(s: str) -> Optional[dt.datetime]:
+    # datetimes are immutable, so sharing cached instances between rows is safe
+    try:
+        return dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
 def _parse_ts(ts: Any) -> Optional[dt.datetime]:
     if ts is None:
         return None
@@ -49,21 +80,29 @@ def _parse_ts(ts: Any) -> Optional[dt.datetime]:
             return dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc)
         except Exception:
             return None
-    try:
-        s = str(ts).replace("Z", "+00:00")
-        return dt.datetime.fromisoformat(s)
-    except Exception:
-        return None
+    # string timestamps repeat heavily within a session; parse each distinct one once
+    return _parse_ts_str(ts if type(ts) is str else str(ts))
+
+def _lower_interned(v: Any, memo: Dict[str, str]) -> str:
+    # str(v).lower(), interned; labels repeat, so str inputs are memoized per batch
+    if type(v) is str:
+        s = memo.get(v)
+        if s is None:
+            s = memo[v] = sys.intern(v.lower())
+        return s
+    return sys.intern(str(v).lower())
 
 def _sec(a: dt.datetime, b: dt.datetime) -> float:
     return (b - a).total_seconds()
 
-def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _normalize_decisions(decisions: List[Dict[str, Any]], *, sort_by_t: bool = False) -> List[Dict[str, Any]]:
     """
     Make keys consistent:
       - ensure 'agent' exists (copied/mapped from actor_type/actor/role when needed)
       - ensure numeric 't' exists (derived from timestamps or sequence order)
       - keep existing duration_s / latency_ms; accept alias names
+    With sort_by_t=True the rows come back stably sorted by t; already-ordered
+    input (the usual case for logs) is detected while t is filled and not re-sorted.
     """
     if not decisions:
         return []
@@ -71,6 +110,10 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
     # First pass: copy and harvest timestamps
     norm_rows: List[Dict[str, Any]] = []
     all_ts: List[dt.datetime] = []
+    present = _present_aliases(decisions)
+    agent_keys, ts_keys = present["agent"], present["timestamp"]
+    dur_keys, lat_keys = present["duration_s"], present["latency_ms"]
+    lc_memo: Dict[str, str] = {}
 
     for e in decisions:
         if not isinstance(e, dict):
@@ -79,17 +122,21 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
 
         # Agent
         if "agent" not in row:
-            raw_agent = _get(row, _ALIASES["agent"])
+            raw_agent = _get(row, agent_keys)
             can = _canon_str(raw_agent)
             mapped = _AGENT_MAP.get(can, raw_agent)
             if mapped is not None:
                 row["agent"] = mapped
             # also mirror actor_type to keep existing HCL logic working
             if "actor_type" not in row and raw_agent is not None:
-                row["actor_type"] = str(raw_agent).lower()
+                row["actor_type"] = _lower_interned(raw_agent, lc_memo)
+
+        # lowercase labels the KPI scan tests, computed once per row (internal helpers)
+        row["_actor_lc"] = _lower_interned(row.get("actor_type", ""), lc_memo)
+        row["_event_lc"] = _lower_interned(row.get("event_type", ""), lc_memo)
 
         # Timestamp
-        ts = _get(row, _ALIASES["timestamp"])
+        ts = _get(row, ts_keys)
         ts_dt = _parse_ts(ts)
         if ts_dt is not None:
             all_ts.append(ts_dt)
@@ -101,7 +148,7 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
 
         # duration_s
         if "duration_s" not in row or row["duration_s"] is None:
-            dur = _get(row, _ALIASES["duration_s"])
+            dur = _get(row, dur_keys)
             if dur is not None:
                 try:
                     row["duration_s"] = float(dur)
@@ -110,7 +157,7 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
 
         # latency_ms
         if "latency_ms" not in row or row["latency_ms"] is None:
-            lat = _get(row, _ALIASES["latency_ms"])
+            lat = _get(row, lat_keys)
             if lat is not None:
                 try:
                     row["latency_ms"] = float(lat)
@@ -122,6 +169,8 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
     # Derive t from timestamps (or from order) if missing
     s_start = min(all_ts) if all_ts else None
     monotonic = 0.0
+    ordered = True
+    prev_t = float("-inf")
     for r in norm_rows:
         if r.get("t") is None:
             if s_start and r.get("_timestamp_dt") is not None:
@@ -129,7 +178,14 @@ def _normalize_decisions(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]
             else:
                 r["t"] = monotonic
                 monotonic += 1.0
-
+        if sort_by_t and ordered:
+            t = float(r["t"])
+            if t < prev_t:
+                ordered = False
+            prev_t = t
+
+    if sort_by_t and not ordered:
+        norm_rows.sort(key=lambda e: float(e["t"]))
     return norm_rows
 
 # -------------------- existing helpers (some made more flexible) --------------------
@@ -140,53 +196,11 @@ def _only_agent_rows(decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if isinstance(e, dict) and ("agent" in e or "actor_type" in e)
     ]
 
-def _total_time(decisions: List[Dict[str, Any]], explicit_T: Optional[float]) -> float:
-    """
-    Prefer explicit_T; else use t-range; else fallback to timestamp range (if present).
-    """
-    if explicit_T is not None:
-        return float(explicit_T)
-    if not decisions:
-        return 0.0
-    # Try t-range
-    try:
-        t0 = float(min(e.get("t", 0.0) for e in decisions))
-        tN = float(max(e.get("t", 0.0) for e in decisions))
-        span = max(0.0, tN - t0)
-        if span > 0:
-            return span
-    except Exception:
-        pass
-    # Fallback: timestamp range (if normalization left _timestamp_dt)
-    ts_vals = [e.get("_timestamp_dt") for e in decisions if e.get("_timestamp_dt") is not None]
-    if ts_vals:
-        return max(0.0, _sec(min(ts_vals), max(ts_vals)))
-    return 0.0
-
-def _durations(decisions: List[Dict[str, Any]]) -> List[float]:
-    # Prefer explicit duration_s, fallback to latency_ms (sec)
-    durs: List[float] = []
-    for e in decisions:
-        if e.get("duration_s") is not None:
-            try:
-                durs.append(max(0.0, float(e["duration_s"])))
-            except Exception:
-                durs.append(0.0)
-        elif e.get("latency_ms") is not None:
-            try:
-                durs.append(max(0.0, float(e["latency_ms"]) / 1000.0))
-            except Exception:
-                durs.append(0.0)
-    return durs
-
-def _mean(xs: List[float]) -> float:
-    return sum(xs) / len(xs) if xs else 0.0
-
 def _clip01(x: float) -> float:
     return max(0.0, min(1.0, x))
 
 def _safe_prob_dist(p: Dict[str, float]) -> Dict[str, float]:
-    total = sum(max(0.0, float(v)) for v in p.values())
+    total = math.fsum(max(0.0, float(v)) for v in p.values())
     if total <= 0:
         return {k: 0.0 for k in p.keys()}
     return {k: max(0.0, float(v)) / total for k, v in p.items()}
@@ -197,33 +211,45 @@ def _aggregate_probs(decisions: List[Dict[str, Any]], key: str) -> Dict[str, flo
     then re-normalize. This yields P_human or P_surrogate for S.
     """
     accum: Dict[str, float] = {}
-    count = 0
     for e in decisions:
-        if key in e and isinstance(e[key], dict) and e[key]:
-            dist = _safe_prob_dist(e[key])
-            for a, p in dist.items():
-                accum[a] = accum.get(a, 0.0) + p
-            count += 1
-    if count == 0 or not accum:
+        p = e.get(key)
+        if not (isinstance(p, dict) and p):
+            continue
+        # normalize the row in place of a per-row _safe_prob_dist dict
+        vals = [max(0.0, float(v)) for v in p.values()]
+        total = math.fsum(vals)
+        scale = 1.0 / total if total > 0 else 0.0
+        for a, v in zip(p, vals):
+            accum[a] = accum.get(a, 0.0) + v * scale
+    if not accum:
         return {}
-    # average and renormalize
-    avg = {k: v / count for k, v in accum.items()}
-    return _safe_prob_dist(avg)
+    # averaging over rows is a uniform scale, which the renormalization absorbs
+    return _safe_prob_dist(accum)
 
 def _kl_divergence(p: Dict[str, float], q: Dict[str, float], eps: float = 1e-12) -> float:
     """
     KL(P||Q) over the union of keys. Both are probabilities over actions.
     """
     keys = set(p.keys()) | set(q.keys())
-    kl = 0.0
+    terms = []
     for k in keys:
         pk = max(eps, p.get(k, 0.0))
         qk = max(eps, q.get(k, 0.0))
-        kl += pk * math.log(pk / qk)
-    return kl
+        terms.append(pk * math.log(pk / qk))
+    # fsum is exactly rounded, so the result no longer depends on set iteration order
+    return math.fsum(terms)
 
-def _count(decisions: List[Dict[str, Any]], pred: Callable[[Dict[str, Any]], bool]) -> int:
-    return sum(1 for e in decisions if pred(e))
+def _t_range(rows: List[Dict[str, Any]]) -> float:
+    """
+    max(t) - min(t) compared as given, for rows carrying string t: all-string t
+    compares lexicographically and mixed str/number t has no range (0.0), so the
+    caller falls back to the timestamp range as before.
+    """
+    try:
+        ts = [e.get("t", 0.0) for e in rows]
+        return max(0.0, float(max(ts)) - float(min(ts)))
+    except Exception:
+        return 0.0
 
 # -------------------- main API (with normalization step) --------------------
 def compute_metrics(
@@ -238,74 +264,139 @@ def compute_metrics(
     Assumes decisions are sorted by 't' ascending.
     Now robust to alias keys and missing 't' via normalization.
     """
-    # NEW: normalize decisions to tolerate aliases/missing fields
-    decisions = _normalize_decisions(decisions)
+    if not decisions and T is None:
+        return dict(_ZERO_METRICS)
 
-    # keep original ordering intent: sort by t (now guaranteed numeric)
-    decisions = sorted(decisions, key=lambda e: float(e.get("t", float("inf"))))
+    # NEW: normalize decisions to tolerate aliases/missing fields, ordered by t
+    # (now guaranteed numeric); the sort is skipped when the input is already ordered
+    decisions = _normalize_decisions(decisions, sort_by_t=True)
+    return _compute_normalized(decisions, T=T, baseline_s=baseline_s, rt_max=rt_max)
+
+def _compute_normalized(
+    decisions: List[Dict[str, Any]],
+    *,
+    T: Optional[float] = None,
+    baseline_s: Optional[float] = DEFAULT_BASELINE_S,
+    rt_max: float = DEFAULT_RT_MAX,
+) -> Dict[str, float]:
+    """
+    compute_metrics body for rows that already went through
+    _normalize_decisions and are sorted by 't'; rows are not copied again.
+    """
     agent_rows = _only_agent_rows(decisions)
     N_agents = len(agent_rows)
 
-    # --- Time window over agent rows only (now uses t or timestamp fallback) ---
-    total_time = _total_time(agent_rows, T)
+    # --- One scan over the sorted rows gathers every per-row statistic below ---
+    dur_sum, dur_n = 0.0, 0          # D: duration_s, else latency_ms (s), clamped at 0
+    hrt_sum, hrt_n = 0.0, 0          # HCL: human response times
+    lat_sum, lat_n = 0.0, 0          # HCL fallback: AI latencies (s)
+    labeled = errors = 0             # Tr
+    offrole_count = progress_count = 0
+    ts_min = ts_max = None           # timestamp fallback for the time window
+    # A: labeled/true counts over the first and last k agent rows (windows may overlap)
+    k = max(1, int(0.2 * N_agents))
+    late_start = N_agents - k
+    early_n = early_true = late_n = late_true = 0
+    i_agent = -1
+    str_t = False                    # numeric-string 't' seen: t-range via _t_range
+
+    for e in decisions:
+        event_type = e["_event_lc"]
+        if event_type == "error":
+            labeled += 1
+            errors += 1
+        elif event_type in ("checklist_progress", "progress"):
+            progress_count += 1
+        if "agent" not in e and "actor_type" not in e:
+            continue
+        i_agent += 1
+        if not str_t and isinstance(e["t"], str):
+            str_t = True
+
+        ts = e.get("_timestamp_dt")
+        if ts is not None:
+            if ts_min is None or ts < ts_min:
+                ts_min = ts
+            if ts_max is None or ts > ts_max:
+                ts_max = ts
+
+        dur = e.get("duration_s")
+        lat = e.get("latency_ms")
+        if dur is not None:
+            try:
+                dur_sum += max(0.0, float(dur))
+            except Exception:
+                pass
+            dur_n += 1
+        elif lat is not None:
+            try:
+                dur_sum += max(0.0, float(lat) / 1000.0)
+            except Exception:
+                pass
+            dur_n += 1
+        if lat is not None:
+            lat_sum += float(lat) / 1000.0
+            lat_n += 1
+        if e["_actor_lc"] == "human" or str(e.get("agent", "")).upper().startswith("H"):
+            hrt_sum += float(dur) if dur is not None else float(e.get("latency_ms", 0.0)) / 1000.0
+            hrt_n += 1
+
+        c = e.get("correct")
+        if c is not None:
+            labeled += 1
+            if c is False:
+                errors += 1
+            if i_agent < k:
+                early_n += 1
+                early_true += c is True
+            if i_agent >= late_start:
+                late_n += 1
+                late_true += c is True
+        if e.get("off_role_action"):
+            offrole_count += 1
+
+    # --- Time window over agent rows only: explicit T, else t-range, else timestamp range ---
+    # rows are sorted by float(t), so with numeric t the range is just last minus first
+    if not agent_rows:
+        t_span = 0.0
+    elif str_t:
+        t_span = _t_range(agent_rows)
+    else:
+        t_span = float(agent_rows[-1]["t"]) - float(agent_rows[0]["t"])
+    if T is not None:
+        total_time = float(T)
+    elif t_span > 0:
+        total_time = t_span
+    elif ts_min is not None:
+        total_time = max(0.0, _sec(ts_min, ts_max))
+    else:
+        total_time = 0.0
 
     # 1) F: interactions per minute (agent-only)
     F = (N_agents / (total_time / 60.0)) if total_time > 0 else 0.0
 
     # 2) D: mean atomic action duration (agent-only)
-    durs = _durations(agent_rows)
-    D = _mean(durs)
+    D = dur_sum / dur_n if dur_n else 0.0
 
     # 3) HCL: prefer human agent rows; fallback to agent rows
-    human_rts = [
-        (float(e["duration_s"]) if e.get("duration_s") is not None
-         else float(e.get("latency_ms", 0.0)) / 1000.0)
-        for e in agent_rows
-        if str(e.get("actor_type", "")).lower() == "human" or str(e.get("agent", "")).upper().startswith("H")
-    ]
-    latencies_s = [
-        float(e.get("latency_ms", 0.0)) / 1000.0
-        for e in agent_rows
-        if e.get("latency_ms") is not None
-    ]
-    if human_rts:
-        mean_rt = _mean(human_rts)
-    elif durs:
-        mean_rt = _mean(durs)
-    elif latencies_s:
-        mean_rt = _mean(latencies_s)
+    if hrt_n:
+        mean_rt = hrt_sum / hrt_n
+    elif dur_n:
+        mean_rt = D
+    elif lat_n:
+        mean_rt = lat_sum / lat_n
     else:
         mean_rt = rt_max if rt_max > 0 else 1.0
     HCL = _clip01(1.0 - (mean_rt / rt_max if rt_max > 0 else 1.0))
 
     # 4) Tr: only score rows that are explicitly labeled OR explicit error events
-    labeled = 0
-    errors = 0
-    for e in agent_rows:
-        if e.get("correct") is not None:
-            labeled += 1
-            if e.get("correct") is False:
-                errors += 1
-    for e in decisions:
-        if str(e.get("event_type", "")).lower() == "error":
-            labeled += 1
-            errors += 1
     Tr = _clip01(1.0 - (errors / labeled if labeled > 0 else 0.0))
 
     # 5) A: adaptability on agent rows; clamp to [-1, 1] via tanh
     if N_agents > 0:
-        k = max(1, int(0.2 * N_agents))
-        early = agent_rows[:k]
-        late = agent_rows[-k:]
-
-        def acc(arr):
-            have = [e for e in arr if e.get("correct") is not None]
-            if not have:
-                return 1.0  # neutral if unlabeled
-            return sum(1 for e in have if e.get("correct") is True) / len(have)
-
-        acc_early = acc(early)
-        acc_late = acc(late)
+        # neutral 1.0 for a window without labels
+        acc_early = early_true / early_n if early_n else 1.0
+        acc_late = late_true / late_n if late_n else 1.0
         denom = max(1e-9, acc_early)
         raw_A = (acc_late - acc_early) / denom
         A = math.tanh(raw_A)  # bounded [-1, 1]
@@ -338,13 +429,7 @@ def compute_metrics(
     EfficiencyScore = 1.0 / (1.0 + float(EL)) if EL >= 0 else 1.0
 
     # ---- Gentle shaping with off-role and progress signals (if present) ----
-    def _count_pred(rows: List[Dict[str, Any]], pred: Callable[[Dict[str, Any]], bool]) -> int:
-        return sum(1 for e in rows if pred(e))
-
-    offrole_count = _count_pred(agent_rows, lambda e: bool(e.get("off_role_action")))
     offrole_rate = (offrole_count / N_agents) if N_agents > 0 else 0.0
-
-    progress_count = _count(decisions, lambda e: str(e.get("event_type", "")).lower() in {"checklist_progress", "progress"})
     progress_rate = (progress_count / max(1.0, total_time)) if total_time > 0 else 0.0  # events/sec
 
     EfficiencyScore *= (1.0 - _OFFROLE_PENALTY_WEIGHT * _clip01(offrole_rate))
@@ -369,7 +454,9 @@ def compute_metrics_by_agent(decisions: List[Dict[str, Any]], **kw) -> Dict[str,
     for d in decs:
         by_agent.setdefault(str(d.get("agent")), []).append(d)
     for agent, arr in by_agent.items():
-        out[agent] = compute_metrics(decisions=arr, **kw)
+        # buckets hold rows normalized (and copied) above; only the t order is missing
+        arr.sort(key=lambda e: float(e["t"]))
+        out[agent] = _compute_normalized(arr, **kw)
     return out
 
 
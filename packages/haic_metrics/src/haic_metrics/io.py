@@ -1,28 +1,50 @@
 import json
+import mmap
 from pathlib import Path
 from typing import Any, Dict, List, Union, Iterable, Optional
 
+try:  # optional: faster JSON decoding
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+if orjson is not None:
+    def _loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity tokens json.dumps writes by default,
+            # which older artifacts contain; json.loads accepts them (and raises
+            # its own ValueError for input that is really malformed)
+            return json.loads(data)
+else:
+    _loads = json.loads
+
 JsonDict = Dict[str, Any]
 
 
 def load_json(path: Union[str, Path]) -> JsonDict:
     path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _loads(path.read_bytes())
 
 
 def load_jsonl(path: Union[str, Path]) -> List[JsonDict]:
     path = Path(path)
     rows: List[JsonDict] = []
-    with path.open("r", encoding="utf-8") as f:
-        for i, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rows.append(json.loads(line))
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {i} of {path}: {e}") from e
+    with path.open("rb") as f:
+        if not path.stat().st_size:
+            return rows  # mmap cannot map an empty file
+        # map the file instead of reading a second full copy into the heap;
+        # the decoder only ever sees one line of bytes at a time
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i, line in enumerate(iter(mm.readline, b""), start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(_loads(line))
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON on line {i} of {path}: {e}") from e
     return rows
 
 
@@ -1,15 +1,11 @@
 from __future__ import annotations
+from collections import defaultdict
 from typing import Dict, List, Any, Iterable, Tuple
-import math
 
-def _pctl(xs: List[float], q: float) -> float | None:
-    if not xs: return None
-    xs = sorted(xs)
-    i = (len(xs) - 1) * q
-    lo, hi = int(math.floor(i)), int(math.ceil(i))
-    if lo == hi: return xs[lo]
-    f = i - lo
-    return xs[lo] * (1 - f) + xs[hi] * f
+from .stats import quantile_matrix as _quantile_matrix, summarize as _summarize
+
+# actions whose latencies latency_percentiles_by groups
+_GROUPED_AI_ACTIONS = frozenset({"ai_evaluated", "classify", "forecast"})
 
 def _latency_ms_from_decision(d: Dict[str, Any]) -> float | None:
     # Primary: latency_ms already in ms
@@ -35,7 +31,7 @@ def latency_percentiles_by(
     Returns Chart.js-friendly payload + SLA caps (if present).
     """
     logs = logs_root.get("logs", [])
-    by_group: Dict[str, List[float]] = {}
+    by_group: Dict[str, List[float]] = defaultdict(list)
 
     # read SLA caps if present
     rt_caps = (logs_root.get("extras", {}) or {}).get("rt_limits", {})
@@ -44,19 +40,14 @@ def latency_percentiles_by(
     for sess in logs:
         group = str(sess.get(group_key, "unknown"))
         for d in sess.get("decisions", []) or []:
-            if str(d.get("action", "")).lower() in {"ai_evaluated", "classify", "forecast"}:
+            if str(d.get("action", "")).lower() in _GROUPED_AI_ACTIONS:
                 v = _latency_ms_from_decision(d)
                 if v is not None:
-                    by_group.setdefault(group, []).append(v)
+                    by_group[group].append(v)
 
     labels = sorted(by_group.keys())
     q_list = list(quantiles)
-    matrix = []
-    for q in q_list:
-        row = []
-        for g in labels:
-            row.append(_pctl(by_group.get(g, []), q))
-        matrix.append(row)
+    matrix = _quantile_matrix([by_group[g] for g in labels], q_list)
 
     return {
         "labels": labels,                # x-axis: groups (models)
@@ -68,7 +59,16 @@ def latency_percentiles_by(
     }
 
 
-_AI_ACTIONS = {"ai_evaluated", "classify", "forecast", "ai_inference", "ai_decision"}
+_AI_ACTIONS = frozenset({"ai_evaluated", "classify", "forecast", "ai_inference", "ai_decision"})
+_AI_AGENTS = frozenset({"ai", "model"})
+
+_EMPTY_AI_LATENCY = {
+    "ai_latency_n": 0,
+    "ai_latency_mean_ms": 0.0,
+    "ai_latency_p50_ms": 0.0,
+    "ai_latency_p90_ms": 0.0,
+    "ai_latency_p95_ms": 0.0,
+}
 
 def compute_latency_metrics(
     decisions: List[Dict[str, Any]],
@@ -79,35 +79,32 @@ def compute_latency_metrics(
     AI latency summary from decisions.
     Returns p50/p90/p95/mean/count (milliseconds).
     """
+    if not decisions:
+        return dict(_EMPTY_AI_LATENCY)
+
     xs: List[float] = []
     for d in decisions:
-        action = (d.get("action") or d.get("event_type") or d.get("type") or "").lower()
+        # permissive filter: either AI agent OR known AI action;
+        # the action is only resolved for rows the agent check does not settle
         agent = (d.get("actor_type") or d.get("agent") or d.get("actor") or "").lower()
-
-        # permissive filter: either AI agent OR known AI action
-        is_ai = agent in ("ai", "model") or (action in _AI_ACTIONS)
-        if not is_ai:
-            continue
+        if agent not in _AI_AGENTS:
+            action = (d.get("action") or d.get("event_type") or d.get("type") or "").lower()
+            if action not in _AI_ACTIONS:
+                continue
 
         ms = _latency_ms_from_decision(d)
         if ms is not None:
             xs.append(ms)
 
     if not xs:
-        return {
-            "ai_latency_n": 0,
-            "ai_latency_mean_ms": 0.0,
-            "ai_latency_p50_ms": 0.0,
-            "ai_latency_p90_ms": 0.0,
-            "ai_latency_p95_ms": 0.0,
-        }
-
-    mean = sum(xs) / len(xs)
-    q50, q90, q95 = quantiles
+        return dict(_EMPTY_AI_LATENCY)
+
+    # mean and all three percentiles come from one summary of the sample
+    mean, (p50, p90, p95) = _summarize(xs, quantiles)
     return {
         "ai_latency_n": float(len(xs)),
         "ai_latency_mean_ms": float(mean),
-        "ai_latency_p50_ms": float(_pctl(xs, q50) or 0.0),
-        "ai_latency_p90_ms": float(_pctl(xs, q90) or 0.0),
-        "ai_latency_p95_ms": float(_pctl(xs, q95) or 0.0),
+        "ai_latency_p50_ms": float(p50),
+        "ai_latency_p90_ms": float(p90),
+        "ai_latency_p95_ms": float(p95),
     }
\ No newline at end of file
@@ -1,5 +1,11 @@
 
-from typing import Dict, List, Any
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from .columnar import DecisionsFrame, _EMPTY, _reverse_index, _to_float
 
 
 
@@ -8,6 +14,7 @@ class Metrics:
     """
     Flexible outcome metrics with alias-aware field access and robust TP/FP/FN/TN derivation.
     Configure positive/negative vocab as needed in _CFG below.
+    Calculators that only sum aliased fields also accept a DecisionsFrame.
     """
 
     # ---- Global config (edit to your domain) ----
@@ -70,30 +77,53 @@ class Metrics:
             "negative","neg","no","0","false","accepted","ok","valid","secure","correct","safe"
         },
 
-        # Strings that mean "correct outcome"
-        "correct_token": {"correct", "true", "1", True},
+        # Strings that mean "correct outcome" (compared after _norm, so True matches "true")
+        "correct_token": {"correct", "true", "1"},
     }
 
+    # Normalized status strings the row-wise calculators test against
+    _OBJ_ACHIEVED = frozenset(("achieved", "done", "met"))
+    _SUCC = frozenset(("successful", "success", "ok"))
+    _CORRECT_STRS = frozenset(("correct", "true"))
+
+    # Flattened once at class load: interned alias tuples per logical key (priority
+    # order) and the reverse index alias -> ((logical key, priority), ...)
+    _ALIAS_TUPLES = {k: tuple(map(sys.intern, v)) for k, v in _CFG["aliases"].items()}
+    _ALIAS_INDEX = _reverse_index(_CFG["aliases"], _CFG["aliases"])
+
     # ---------- helpers ----------
     @staticmethod
     def _pick(item, keys, default=None):
         for k in keys:
-            if k in item and item[k] not in (None, "", [], {}):
-                return item[k]
+            # one probe per alias; a missing key reads as None, which _EMPTY rejects
+            v = item.get(k)
+            if v not in _EMPTY:
+                return v
         return default
 
     @classmethod
     def _get(cls, item, logical_key, default=None):
-        return cls._pick(item, cls._CFG["aliases"][logical_key], default)
+        return cls._pick(item, cls._ALIAS_TUPLES[logical_key], default)
 
-    @staticmethod
-    def _to_float(x, default=0.0):
-        try:
-            if isinstance(x, bool):
-                return 1.0 if x else 0.0
-            return float(x)
-        except Exception:
-            return default
+    @classmethod
+    def _get_bool(cls, item, logical_key) -> bool:
+        """bool(_get(item, logical_key, False)) without the separate bool() pass."""
+        for k in cls._ALIAS_TUPLES[logical_key]:
+            v = item.get(k)
+            if v:
+                return True
+            if v not in _EMPTY:
+                return False  # a present falsy value (0, False) still wins over later aliases
+        return False
+
+    _to_float = staticmethod(_to_float)
+
+    @classmethod
+    def _frame(cls, interaction_data, fields) -> DecisionsFrame:
+        """Accept a DecisionsFrame as-is; build one with just `fields` from a row list."""
+        if isinstance(interaction_data, DecisionsFrame):
+            return interaction_data
+        return DecisionsFrame.from_rows(interaction_data, aliases=cls._CFG["aliases"], fields=fields)
 
     @classmethod
     def _response_seconds(cls, item):
@@ -106,21 +136,59 @@ class Metrics:
             return cls._to_float(ms, 0.0) / 1000.0
         return 0.0
 
+    # Polarity table: normalized label -> 1 (positive) / 0 (negative). Later updates
+    # win, so the vocab takes precedence over the numeric / boolean fallbacks.
+    # Built at class load: after editing the vocab, reassign it from _build_polarity(_CFG)
+    # and call _polarity_str.cache_clear().
+    @staticmethod
+    def _build_polarity(cfg):
+        table = dict.fromkeys(("1", "true", "t", "yes"), 1)
+        table.update(dict.fromkeys(("0", "false", "f", "no"), 0))
+        table.update(dict.fromkeys(cfg["negative_vocab"], 0))
+        table.update(dict.fromkeys(cfg["positive_vocab"], 1))
+        return table
+
+    _POL_TABLE = _build_polarity(_CFG)
+
     @classmethod
-    def _is_positive(cls, label):
+    def _polarity(cls, label) -> int:
+        """1 positive, 0 negative, -1 unknown (including None)."""
         if label is None:
-            return None
-        s = str(label).strip().lower()
-        if s in cls._CFG["positive_vocab"]:
-            return True
-        if s in cls._CFG["negative_vocab"]:
-            return False
-        # numeric / boolean fallbacks
-        if s in {"1", "true", "t", "yes"}:
-            return True
-        if s in {"0", "false", "f", "no"}:
-            return False
-        return None  # unknown
+            return -1
+        if label is True or label is False:
+            return int(label)  # "true"/"false" are in the vocab; skip the str round-trip
+        return cls._polarity_str(label if type(label) is str else str(label))
+
+    # Labels come from a small vocabulary, so the lookup is memoized per distinct string
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _polarity_str(label: str) -> int:
+        return Metrics._POL_TABLE.get(label.strip().lower(), -1)
+
+    @classmethod
+    def _is_positive(cls, label):
+        """True / False / None (unknown) view of _polarity."""
+        return (None, False, True)[cls._polarity(label) + 1]
+
+    @classmethod
+    def _norm(cls, x) -> str:
+        """str(x).strip().lower(); memoized for strings, no str() round-trip for bools."""
+        if type(x) is str:
+            return cls._norm_str(x)
+        if x is True or x is False:
+            return "true" if x else "false"
+        return str(x).strip().lower()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _norm_str(s: str) -> str:
+        return s.strip().lower()
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _result_label_code(label: str):
+        """'true_positive'/'FP'/... -> confusion cell index (see _confusion_cell), else None."""
+        return Metrics._RESULT_LABEL_CODES.get(label.strip().lower())
 
     @classmethod
     def _derive_confusion_from_result_label(cls, val):
@@ -129,12 +197,15 @@ class Metrics:
         """
         if not val:
             return None
-        s = str(val).strip().lower()
-        if s in {"true_positive","tp"}:  return {"tp":1,"fp":0,"tn":0,"fn":0}
-        if s in {"false_positive","fp"}: return {"tp":0,"fp":1,"tn":0,"fn":0}
-        if s in {"true_negative","tn"}:  return {"tp":0,"fp":0,"tn":1,"fn":0}
-        if s in {"false_negative","fn"}: return {"tp":0,"fp":0,"tn":0,"fn":1}
-        return None
+        code = cls._result_label_code(val if type(val) is str else str(val))
+        if code is None:
+            return None
+        return cls._one_hot(code)
+
+    @staticmethod
+    def _one_hot(code: int) -> Dict[str, int]:
+        """Fresh {"tp","fp","tn","fn"} dict for a cell index (_ZERO_CONF: all zeros)."""
+        return dict(zip(("tp", "fp", "tn", "fn"), Metrics._ONE_HOT[code]))
 
     @classmethod
     def _derive_confusion_from_pair(cls, pred, gt):
@@ -142,37 +213,66 @@ class Metrics:
         Try to infer TP/FP/TN/FN from prediction/ground-truth labels using vocab.
         Returns dict or None if unknown.
         """
-        p = cls._is_positive(pred)
-        g = cls._is_positive(gt)
-        if p is None or g is None:
+        p = cls._polarity(pred)
+        g = cls._polarity(gt)
+        if p < 0 or g < 0:
             return None
-        if p and g:   return {"tp":1,"fp":0,"tn":0,"fn":0}
-        if p and not g: return {"tp":0,"fp":1,"tn":0,"fn":0}
-        if not p and not g: return {"tp":0,"fp":0,"tn":1,"fn":0}
-        if not p and g:   return {"tp":0,"fp":0,"tn":0,"fn":1}
+        return cls._one_hot(cls._PAIR_CELL[(p << 1) | g])
 
     @classmethod
     def _derive_confusion(cls, item):
         """
         Order:
           1) explicit result_label true_positive/...
-          2) (prediction, ground_truth)
-          3) (ai_decision, op_decision) routed via aliases above
+          2) (prediction, ground_truth), which also covers ai_decision/op_decision
+             logs since those are aliases of the same logical fields
         """
-        lbl = cls._get(item, "result_label")
-        c = cls._derive_confusion_from_result_label(lbl)
-        if c: return c
+        code = cls._confusion_code(item)
+        return cls._one_hot(cls._ZERO_CONF if code is None else code)
+
+    # Confusion cells as small ints: index into (tp, fp, tn, fn)
+    _TP, _FP, _TN, _FN = 0, 1, 2, 3
+    _RESULT_LABEL_CODES = {
+        "true_positive": 0, "tp": 0,
+        "false_positive": 1, "fp": 1,
+        "true_negative": 2, "tn": 2,
+        "false_negative": 3, "fn": 3,
+    }
+    # (prediction polarity << 1) | ground-truth polarity -> cell: 00 tn, 01 fn, 10 fp, 11 tp
+    _PAIR_CELL = (2, 3, 1, 0)
+    # (tp, fp, tn, fn) per cell index; the extra _ZERO_CONF row is "no derivable cell"
+    _ZERO_CONF = 4
+    _ONE_HOT = ((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1), (0, 0, 0, 0))
 
-        pred = cls._get(item, "prediction")
-        gt   = cls._get(item, "ground_truth")
-        c = cls._derive_confusion_from_pair(pred, gt)
-        if c: return c
+    @classmethod
+    def _confusion_code(cls, item) -> Optional[int]:
+        """
+        Same derivation order as _derive_confusion, as a cell index (or None)
+        instead of a one-hot dict, so a batch can be tallied with Counter.
+        """
+        return cls._confusion_cell(
+            cls._get(item, "result_label"), cls._get(item, "prediction"), cls._get(item, "ground_truth")
+        )
 
-        # Some logs only have ai_decision/op_decision under the same aliases
-        ai_dec = cls._get(item, "prediction")
-        op_dec = cls._get(item, "ground_truth")
-        c = cls._derive_confusion_from_pair(ai_dec, op_dec)
-        return c or {"tp":0,"fp":0,"tn":0,"fn":0}
+    @classmethod
+    def _confusion_cell(cls, lbl, pred, gt) -> Optional[int]:
+        if lbl:
+            code = cls._result_label_code(lbl if type(lbl) is str else str(lbl))
+            if code is not None:
+                return code
+        p = cls._polarity(pred)
+        if p < 0:
+            return None
+        g = cls._polarity(gt)
+        if g < 0:
+            return None
+        return cls._PAIR_CELL[(p << 1) | g]
+
+    @classmethod
+    def _confusion_counts(cls, interaction_data) -> Tuple[int, int, int, int]:
+        """(tp, fp, tn, fn) over a batch; rows with no derivable cell count nowhere."""
+        cells = Counter(map(cls._confusion_code, interaction_data))
+        return cells[0], cells[1], cells[2], cells[3]
 
     @classmethod
     def _bool_correct(cls, item):
@@ -183,53 +283,40 @@ class Metrics:
         # Accept strings like "correct"/"incorrect"
         s = cls._get(item, "result_correct_str")
         if s is not None:
-            return str(s).strip().lower() in cls._CFG["correct_token"]
-        # Fallback from confusion one-hot if available
-        conf = cls._derive_confusion(item)
-        # correct if TP or TN
-        return (conf.get("tp",0) + conf.get("tn",0)) > 0
+            return cls._norm(s) in cls._CFG["correct_token"]
+        # Fallback from the derived confusion cell: correct if TP or TN
+        return cls._confusion_code(item) in (cls._TP, cls._TN)
 
     # ---------- Effectiveness ----------
     class Effectiveness:
         @staticmethod
         def calculate_prediction_accuracy(interaction_data):
-            # accuracy = (TP + TN) / N
-            tp = tn = 0
-            n = 0
-            for it in interaction_data:
-                conf = Metrics._derive_confusion(it)
-                tp += conf.get("tp", 0); tn += conf.get("tn", 0)
-                n += sum(conf.values()) or 1  # assume 1 when not explicit
+            # accuracy = (TP + TN) / N, every row counting once towards N
+            tp, _, tn, _ = Metrics._confusion_counts(interaction_data)
+            n = len(interaction_data)
             return (tp + tn) / n if n > 0 else 0.0
 
         @staticmethod
         def calculate_precision(interaction_data):
-            tp = fp = 0
-            for it in interaction_data:
-                conf = Metrics._derive_confusion(it)
-                tp += conf.get("tp", 0); fp += conf.get("fp", 0)
+            tp, fp, _, _ = Metrics._confusion_counts(interaction_data)
             return tp / (tp + fp) if (tp + fp) > 0 else 0.0
 
         @staticmethod
         def calculate_recall(interaction_data):
-            tp = fn = 0
-            for it in interaction_data:
-                conf = Metrics._derive_confusion(it)
-                tp += conf.get("tp", 0); fn += conf.get("fn", 0)
+            tp, _, _, fn = Metrics._confusion_counts(interaction_data)
             return tp / (tp + fn) if (tp + fn) > 0 else 0.0
 
         @staticmethod
         def calculate_overall_system_accuracy(interaction_data):
-            correct = 0; total = 0
-            for it in interaction_data:
-                correct += 1 if Metrics._bool_correct(it) else 0
-                total += 1
+            correct = sum(map(Metrics._bool_correct, interaction_data))
+            total = len(interaction_data)
             return (correct / total) * 100 if total > 0 else 0.0
 
         @staticmethod
         def calculate_model_improvement_rate(interaction_data):
-            t  = sum(Metrics._to_float(Metrics._get(it, "post_adaptation_performance"), 0.0) for it in interaction_data)
-            t1 = sum(Metrics._to_float(Metrics._get(it, "pre_adaptation_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("post_adaptation_performance", "pre_adaptation_performance"))
+            t  = f.sum("post_adaptation_performance")
+            t1 = f.sum("pre_adaptation_performance")
             dt = len(interaction_data) or 0
             # If you have explicit time deltas, alias them to "time_interval" and use that instead:
             explicit_dt = sum(Metrics._to_float(it.get("time_interval", 0.0), 0.0) for it in interaction_data)
@@ -245,75 +332,85 @@ class Metrics:
 
         @staticmethod
         def calculate_teaching_efficiency(interaction_data):
-            gain = sum(Metrics._to_float(Metrics._get(it, "performance_improvement"), 0.0) for it in interaction_data)
-            spent = sum(Metrics._to_float(Metrics._get(it, "time_spent"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("performance_improvement", "time_spent"))
+            gain = f.sum("performance_improvement")
+            spent = f.sum("time_spent")
             return (gain / spent) if spent > 0 else 0.0
 
         @staticmethod
         def calculate_query_efficiency(interaction_data):
             total = len(interaction_data)
-            hits = sum(1 for it in interaction_data if bool(Metrics._get(it, "reached_target", False)))
+            hits = sum(1 for it in interaction_data if Metrics._get_bool(it, "reached_target"))
             return (total / hits) if hits > 0 else 0.0
 
         @staticmethod
         def calculate_resource_utilization(interaction_data):
-            used = sum(Metrics._to_float(Metrics._get(it, "resources_used"), 0.0) for it in interaction_data)
-            tot  = sum(Metrics._to_float(Metrics._get(it, "total_resources"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("resources_used", "total_resources"))
+            used = f.sum("resources_used")
+            tot  = f.sum("total_resources")
             return (used / tot) * 100.0 if tot > 0 else 0.0
 
         @staticmethod
         def calculate_task_completion_time(interaction_data):
-            t_wo = sum(Metrics._to_float(Metrics._get(it, "time_without_ai"), 0.0) for it in interaction_data)
-            t_w  = sum(Metrics._to_float(Metrics._get(it, "time_with_ai"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("time_without_ai", "time_with_ai"))
+            t_wo = f.sum("time_without_ai")
+            t_w  = f.sum("time_with_ai")
             return t_wo - t_w
 
         @staticmethod
         def calculate_correction_efficiency(interaction_data):
-            eff = sum(Metrics._to_float(Metrics._get(it, "correction_effectiveness"), 0.0) for it in interaction_data)
-            time = sum(Metrics._to_float(Metrics._get(it, "correction_time"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("correction_effectiveness", "correction_time"))
+            eff = f.sum("correction_effectiveness")
+            time = f.sum("correction_time")
             return (eff / time) if time > 0 else 0.0
 
         @staticmethod
         def calculate_error_reduction_rate(interaction_data):
-            before = sum(Metrics._to_float(Metrics._get(it, "errors_before"), 0.0) for it in interaction_data)
-            after  = sum(Metrics._to_float(Metrics._get(it, "errors_after"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("errors_before", "errors_after"))
+            before = f.sum("errors_before")
+            after  = f.sum("errors_after")
             return ((before - after) / before) * 100.0 if before > 0 else 0.0
 
         @staticmethod
         def calculate_knowledge_retention(interaction_data):
-            pre  = sum(Metrics._to_float(Metrics._get(it, "pre_retention_performance"), 0.0) for it in interaction_data)
-            post = sum(Metrics._to_float(Metrics._get(it, "post_retention_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("pre_retention_performance", "post_retention_performance"))
+            pre  = f.sum("pre_retention_performance")
+            post = f.sum("post_retention_performance")
             return (post / pre) * 100.0 if pre > 0 else 0.0
 
     # ---------- Adaptability & Learning ----------
     class AdaptabilityAndLearning:
         @staticmethod
         def calculate_feedback_impact(interaction_data):
-            pre  = sum(Metrics._to_float(Metrics._get(it, "pre_feedback_performance"), 0.0) for it in interaction_data)
-            post = sum(Metrics._to_float(Metrics._get(it, "post_feedback_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("pre_feedback_performance", "post_feedback_performance"))
+            pre  = f.sum("pre_feedback_performance")
+            post = f.sum("post_feedback_performance")
             return post - pre
 
         @staticmethod
         def calculate_adaptability_score(interaction_data):
-            pre  = sum(Metrics._to_float(Metrics._get(it, "pre_adaptation_performance"), 0.0) for it in interaction_data)
-            post = sum(Metrics._to_float(Metrics._get(it, "post_adaptation_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("pre_adaptation_performance", "post_adaptation_performance"))
+            pre  = f.sum("pre_adaptation_performance")
+            post = f.sum("post_adaptation_performance")
             return post - pre
 
         @staticmethod
         def calculate_impact_of_corrections(interaction_data):
-            pre  = sum(Metrics._to_float(Metrics._get(it, "pre_correction_performance"), 0.0) for it in interaction_data)
-            post = sum(Metrics._to_float(Metrics._get(it, "post_correction_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("pre_correction_performance", "post_correction_performance"))
+            pre  = f.sum("pre_correction_performance")
+            post = f.sum("post_correction_performance")
             return post - pre
 
         @staticmethod
         def calculate_learning_efficiency(interaction_data):
-            gains = sum(Metrics._to_float(Metrics._get(it, "performance_improvement"), 0.0) for it in interaction_data)
-            time  = sum(Metrics._to_float(Metrics._get(it, "time_spent"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("performance_improvement", "time_spent"))
+            gains = f.sum("performance_improvement")
+            time  = f.sum("time_spent")
             return gains / time if time > 0 else 0.0
 
         @staticmethod
         def calculate_objective_fulfillment_rate(interaction_data):
-            achieved = sum(1 for it in interaction_data if str(Metrics._get(it, "ground_truth", "")).strip().lower() in {"achieved","done","met"} or str(it.get("objective_status","")).lower()=="achieved")
+            achieved = sum(1 for it in interaction_data if Metrics._norm(Metrics._get(it, "ground_truth", "")) in Metrics._OBJ_ACHIEVED or str(it.get("objective_status","")).lower()=="achieved")
             total = len(interaction_data)
             return achieved / total if total > 0 else 0.0
 
@@ -328,7 +425,7 @@ class Metrics:
                 if h is None and a is None:
                     continue
                 total += 1
-                agree += 1 if str(h).strip().lower() == str(a).strip().lower() else 0
+                agree += 1 if Metrics._norm(h) == Metrics._norm(a) else 0
             return agree / total if total > 0 else 0.0
 
         @staticmethod
@@ -339,7 +436,7 @@ class Metrics:
 
         @staticmethod
         def calculate_decision_effectiveness(interaction_data):
-            succ = sum(1 for it in interaction_data if str(it.get("decision_outcome","")).strip().lower() in {"successful","success","ok"})
+            succ = sum(1 for it in interaction_data if Metrics._norm(it.get("decision_outcome","")) in Metrics._SUCC)
             total = len(interaction_data)
             return (succ / total) * 100.0 if total > 0 else 0.0
 
@@ -350,46 +447,57 @@ class Metrics:
 
         @staticmethod
         def calculate_human_effort_saved(interaction_data):
-            w = sum(Metrics._to_float(Metrics._get(it, "time_without_ai"), 0.0) for it in interaction_data)
-            a = sum(Metrics._to_float(Metrics._get(it, "time_with_ai"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("time_without_ai", "time_with_ai"))
+            w = f.sum("time_without_ai")
+            a = f.sum("time_with_ai")
             return w - a
 
     # ---------- Trust & Safety ----------
     class TrustAndSafety:
         @staticmethod
         def calculate_confidence(interaction_data):
-            high = [it for it in interaction_data if Metrics._to_float(Metrics._get(it, "confidence_level"), 0.0) >= 0.9]
-            good = [it for it in high if str(Metrics._get(it, "result_correct_str","")).strip().lower() in {"correct","true"} or Metrics._bool_correct(it)]
-            return (len(good) / len(high)) * 100.0 if high else 0.0
+            # one pass: correctness is only resolved for high-confidence rows
+            high = good = 0
+            for it in interaction_data:
+                if Metrics._to_float(Metrics._get(it, "confidence_level"), 0.0) >= 0.9:
+                    high += 1
+                    if Metrics._norm(Metrics._get(it, "result_correct_str","")) in Metrics._CORRECT_STRS or Metrics._bool_correct(it):
+                        good += 1
+            return (good / high) * 100.0 if high else 0.0
 
         @staticmethod
         def calculate_trust_score(interaction_data):
-            ratings = sum(Metrics._to_float(Metrics._get(it, "trust_rating"), 0.0) for it in interaction_data)
-            scale   = sum(Metrics._to_float(Metrics._get(it, "trust_scale_maximum"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("trust_rating", "trust_scale_maximum"))
+            ratings = f.sum("trust_rating")
+            scale   = f.sum("trust_scale_maximum")
             return (ratings / scale) * 100.0 if scale > 0 else 0.0
 
         @staticmethod
         def calculate_safety_incidents(interaction_data):
-            return sum(Metrics._to_float(Metrics._get(it, "safety_incidents"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("safety_incidents",))
+            return f.sum("safety_incidents")
 
         @staticmethod
         def calculate_system_reliability(interaction_data):
-            up  = sum(Metrics._to_float(Metrics._get(it, "uptime"), 0.0) for it in interaction_data)
-            tot = sum(Metrics._to_float(Metrics._get(it, "total_time"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("uptime", "total_time"))
+            up  = f.sum("uptime")
+            tot = f.sum("total_time")
             return (up / tot) * 100.0 if tot > 0 else 0.0
 
     # ---------- Robustness & Generalization ----------
     class RobustnessAndGeneralization:
         @staticmethod
         def calculate_adversarial_robustness(interaction_data):
-            adv = sum(Metrics._to_float(Metrics._get(it, "performance_adversarial"), 0.0) for it in interaction_data)
-            nor = sum(Metrics._to_float(Metrics._get(it, "performance_normal"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("performance_adversarial", "performance_normal"))
+            adv = f.sum("performance_adversarial")
+            nor = f.sum("performance_normal")
             return adv / nor if nor > 0 else 0.0
 
         @staticmethod
         def calculate_domain_generalization(interaction_data):
-            diff = sum(Metrics._to_float(Metrics._get(it, "performance_across_domains"), 0.0) for it in interaction_data)
-            base = sum(Metrics._to_float(Metrics._get(it, "baseline_performance"), 0.0) for it in interaction_data)
+            f = Metrics._frame(interaction_data, ("performance_across_domains", "baseline_performance"))
+            diff = f.sum("performance_across_domains")
+            base = f.sum("baseline_performance")
             return diff / base if base > 0 else 0.0
 
     @staticmethod
@@ -439,22 +547,175 @@ class Metrics:
         }
 
 
+@dataclass(slots=True)
+class _OutcomeTotals:
+    """Accumulators behind compute_outcome_metrics, filled in one pass."""
+    n: int = 0
+    tp: int = 0
+    fp: int = 0
+    tn: int = 0
+    fn: int = 0
+    agree: int = 0
+    agree_total: int = 0
+    trust_num: float = 0.0
+    trust_den: float = 0.0
+
+    def tally(self, lbl, pred, gt, w: int = 1) -> None:
+        """Count w rows sharing one (result_label, prediction, ground_truth) triple."""
+        code = Metrics._confusion_cell(lbl, pred, gt)
+        if code == 0:
+            self.tp += w
+        elif code == 1:
+            self.fp += w
+        elif code == 2:
+            self.tn += w
+        elif code == 3:
+            self.fn += w
+
+        if gt is not None or pred is not None:
+            self.agree_total += w
+            if Metrics._norm(gt) == Metrics._norm(pred):
+                self.agree += w
+
+    def add(self, other: "_OutcomeTotals") -> None:
+        self.n += other.n
+        self.tp += other.tp
+        self.fp += other.fp
+        self.tn += other.tn
+        self.fn += other.fn
+        self.agree += other.agree
+        self.agree_total += other.agree_total
+        self.trust_num += other.trust_num
+        self.trust_den += other.trust_den
+
+
+# Logical fields compute_outcome_metrics reads; the frame is built with only these
+_CORE_FIELDS = ("result_label", "prediction", "ground_truth", "trust_rating", "trust_scale_maximum")
+
+
+# Label types whose equal values (same type) always render alike under _norm
+_EXACT_LABEL_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _label_groups(lbls: List[Any], preds: List[Any], gts: List[Any]):
+    """
+    ((lbl, pred, gt), row count) for every distinct label triple.
+
+    Label columns hold a handful of distinct values, so counting identical triples
+    (zip/map/Counter all run in C) and classifying each once replaces per-row
+    Python work. Values are keyed with their type, since 1 == True == 1.0 hash alike
+    but classify differently. Other types can hold equal values that render
+    differently (-0.0 and 0.0), so when any occur the triples are keyed on repr
+    instead. Unhashable values fall back to one group per row.
+    """
+    try:
+        counts = Counter(zip(map(type, lbls), lbls, map(type, preds), preds, map(type, gts), gts))
+    except TypeError:
+        return (((l, p, g), 1) for l, p, g in zip(lbls, preds, gts))
+    if {t for key in counts for t in key[::2]} <= _EXACT_LABEL_TYPES:
+        return (((l, p, g), w) for (_, l, _, p, _, g), w in counts.items())
+    keys = list(zip(map(type, lbls), map(repr, lbls), map(type, preds), map(repr, preds), map(type, gts), map(repr, gts)))
+    # first row of each group as its representative (later duplicates overwrite earlier)
+    first = dict(zip(reversed(keys), zip(reversed(lbls), reversed(preds), reversed(gts))))
+    return ((first[key], w) for key, w in Counter(keys).items())
+
+
+def _aggregate(frame: DecisionsFrame) -> _OutcomeTotals:
+    """
+    Confusion counts and agreement from the label columns (one classification per
+    distinct label triple); trust comes from two column sums.
+    """
+    acc = _OutcomeTotals(n=frame.n)
+    cols = frame.fields
+    label_cols = ("result_label", "prediction", "ground_truth")
+    # a profile's frame only carries the columns it reads (see _PROFILES)
+    groups = _label_groups(*(frame.col(c) for c in label_cols)) if all(c in cols for c in label_cols) else ()
+    for (lbl, pred, gt), w in groups:
+        acc.tally(lbl, pred, gt, w)
+
+    if "trust_rating" in cols and "trust_scale_maximum" in cols:
+        acc.trust_num = frame.sum("trust_rating")
+        acc.trust_den = frame.sum("trust_scale_maximum")
+    return acc
+
+
+# Per-profile plan, resolved once per call by name: the frame columns the profile
+# reads (everything else is never resolved) and each output as a function of the
+# single-pass totals
+_PROFILES = {
+    "core_outcomes": (
+        _CORE_FIELDS,
+        (
+            ("outcome_prediction_accuracy", lambda a: (a.tp + a.tn) / a.n if a.n > 0 else 0.0),
+            ("outcome_precision", lambda a: a.tp / (a.tp + a.fp) if (a.tp + a.fp) > 0 else 0.0),
+            ("outcome_recall", lambda a: a.tp / (a.tp + a.fn) if (a.tp + a.fn) > 0 else 0.0),
+            ("outcome_human_ai_agreement_rate", lambda a: a.agree / a.agree_total if a.agree_total > 0 else 0.0),
+            ("outcome_trust_score", lambda a: (a.trust_num / a.trust_den) * 100.0 if a.trust_den > 0 else 0.0),
+        ),
+    ),
+}
+
+
+class OnlineAggregator:
+    """
+    Running outcome totals for logs that grow between reads: feed rows with
+    update() (or batches with extend()) and read the profile's metrics with
+    snapshot() in O(1), without keeping the decisions around.
+    Exposed as Metrics.OnlineAggregator.
+
+    Totals are additive, so shards can be reduced separately (e.g. in worker
+    processes; aggregators pickle) and combined with merge().
+    """
+
+    __slots__ = ("profile", "_totals")
+
+    def __init__(self, profile: str = "core_outcomes"):
+        if profile not in _PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        self.profile = profile
+        self._totals = _OutcomeTotals()
+
+    def update(self, row: Dict[str, Any]) -> None:
+        get = Metrics._get
+        a = self._totals
+        a.n += 1
+        a.tally(get(row, "result_label"), get(row, "prediction"), get(row, "ground_truth"))
+        a.trust_num += Metrics._to_float(get(row, "trust_rating"), 0.0)
+        a.trust_den += Metrics._to_float(get(row, "trust_scale_maximum"), 0.0)
+
+    def extend(self, decisions: Union[List[Dict[str, Any]], DecisionsFrame]) -> None:
+        """Fold in a batch through the columnar path (one classification per distinct triple)."""
+        fields, _ = _PROFILES[self.profile]
+        self._totals.add(_aggregate(Metrics._frame(decisions, fields)))
+
+    def merge(self, other: "OnlineAggregator") -> "OnlineAggregator":
+        """Fold another aggregator's totals into this one (same profile); returns self."""
+        if other.profile != self.profile:
+            raise ValueError(f"Cannot merge profile {other.profile!r} into {self.profile!r}")
+        self._totals.add(other._totals)
+        return self
+
+    def snapshot(self) -> Dict[str, float]:
+        a = self._totals
+        _, outputs = _PROFILES[self.profile]
+        return {name: derive(a) for name, derive in outputs}
+
+
+Metrics.OnlineAggregator = OnlineAggregator
+
+
 def compute_outcome_metrics(
-    decisions: List[Dict[str, Any]],
+    decisions: Union[List[Dict[str, Any]], DecisionsFrame],
     *,
     profile: str = "core_outcomes",
 ) -> Dict[str, float]:
     """
     Outcome/quality catalogue (opt-in).
     'core_outcomes' focuses on generic, commonly-available outcome measures.
+    Accepts a decisions list or a prebuilt DecisionsFrame.
     """
-    if profile != "core_outcomes":
-        raise ValueError(f"Unknown profile: {profile}")
-
-    return {
-        "outcome_prediction_accuracy": float(Metrics.Effectiveness.calculate_prediction_accuracy(decisions)),
-        "outcome_precision": float(Metrics.Effectiveness.calculate_precision(decisions)),
-        "outcome_recall": float(Metrics.Effectiveness.calculate_recall(decisions)),
-        "outcome_human_ai_agreement_rate": float(Metrics.CollaborationAndInteraction.calculate_human_ai_agreement_rate(decisions)),
-        "outcome_trust_score": float(Metrics.TrustAndSafety.calculate_trust_score(decisions)),
-    }
\ No newline at end of file
+    # Same formulas as the Effectiveness / Collaboration / Trust calculators,
+    # fed from one pass instead of five
+    agg = OnlineAggregator(profile)
+    agg.extend(decisions)
+    return agg.snapshot()
\ No newline at end of file
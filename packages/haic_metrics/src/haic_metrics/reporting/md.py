@@ -1,6 +1,48 @@
+import re
 from datetime import datetime, timezone
 from haic_metrics.reporting.templates import REPORT_MD_TEMPLATE
 
+# {{#if xs}}head{{#each xs}}item{{/each}}{{else}}fallback{{/if}} (else optional, no nesting)
+_SECTION_RE = re.compile(
+    r"\{\{#if ([\w.]+)\}\}\n(.*?)\{\{#each \1\}\}\n(.*?)\{\{/each\}\}\n(?:\{\{else\}\}\n(.*?))?\{\{/if\}\}\n",
+    re.S,
+)
+# a {{ a.b }} marker, or a literal brace to escape
+_FIELD_RE = re.compile(r"\{\{ ([\w.]+) \}\}|([{}])")
+
+
+def _fields(text: str) -> str:
+    """Turn {{ a.b }} markers into {a_b} format fields and escape literal braces."""
+    return _FIELD_RE.sub(lambda m: m.group(2) * 2 if m.group(2) else "{" + m.group(1).replace(".", "_") + "}", text)
+
+
+def _compile(template: str):
+    """
+    Compile the template once into a str.format_map string plus its list sections.
+    Each section becomes one {<list>_section} field; sections maps that field name
+    to (list key, head, per-item format, fallback).
+    """
+    sections = {}
+
+    def section(m):
+        key = m.group(1).replace(".", "_")
+        name = f"{key}_section"
+        sections[name] = (key, m.group(2), _fields(m.group(3)), m.group(4) or "")
+        return "\0" + name + "\0"
+
+    body = _fields(_SECTION_RE.sub(section, template))
+    return re.sub("\0(\\w+)\0", r"{\1}", body), sections
+
+
+_FORMAT, _SECTIONS = _compile(REPORT_MD_TEMPLATE)
+
+
+class _Values(dict):
+    """format_map mapping: values not provided by the result render as n/a."""
+
+    def __missing__(self, key):
+        return "n/a"
+
 
 def render_markdown_report(
     *,
@@ -15,49 +57,39 @@ def render_markdown_report(
     warnings = result.get("warnings", [])
 
     meta = artifact.get("meta", {})
-    ts = meta.get("timestamps", {})
-
-    # Simple replacements (no templating engine needed yet)
-    md = REPORT_MD_TEMPLATE
-
-    def repl(key, value):
-        nonlocal md
-        md = md.replace(key, str(value))
-
-    repl("{{ run_id }}", meta.get("run_id", "n/a"))
-    repl("{{ session_id }}", meta.get("session_id", "n/a"))
-    repl("{{ pilot_tag }}", meta.get("pilot_tag", "n/a"))
-    repl("{{ app_mode }}", meta.get("application", {}).get("mode", "n/a"))
-    repl("{{ model_name }}", meta.get("ai_system", {}).get("name", "n/a"))
-    repl("{{ model_version }}", meta.get("ai_system", {}).get("version", "n/a"))
-
-    repl("{{ window.basis }}", window.get("basis", "n/a"))
-    repl("{{ window.requested }}", window.get("requested", {}))
-    repl("{{ window.effective }}", window.get("effective", {}))
-    repl("{{ window.duration_s }}", window.get("duration_s", 0.0))
-    repl("{{ window.counts.events_used }}", window.get("counts", {}).get("events_used", 0))
-    repl("{{ window.counts.events_total }}", window.get("counts", {}).get("events_total", 0))
-    repl("{{ window.counts.decisions_used }}", window.get("counts", {}).get("decisions_used", 0))
-    repl("{{ window.counts.decisions_total }}", window.get("counts", {}).get("decisions_total", 0))
+    counts = window.get("counts", {})
 
+    # One flat mapping, rendered in a single format_map pass
+    vals = _Values(
+        run_id=meta.get("run_id", "n/a"),
+        session_id=meta.get("session_id", "n/a"),
+        pilot_tag=meta.get("pilot_tag", "n/a"),
+        app_mode=meta.get("application", {}).get("mode", "n/a"),
+        model_name=meta.get("ai_system", {}).get("name", "n/a"),
+        model_version=meta.get("ai_system", {}).get("version", "n/a"),
+        window_basis=window.get("basis", "n/a"),
+        window_requested=window.get("requested", {}),
+        window_effective=window.get("effective", {}),
+        window_duration_s=window.get("duration_s", 0.0),
+        window_counts_events_used=counts.get("events_used", 0),
+        window_counts_events_total=counts.get("events_total", 0),
+        window_counts_decisions_used=counts.get("decisions_used", 0),
+        window_counts_decisions_total=counts.get("decisions_total", 0),
+        artifact_path=artifact_path,
+        version_metrics=version_metrics,
+        version_logging=version_logging,
+        generated_at=datetime.now(timezone.utc).isoformat(),
+        warnings=warnings,
+        window_notes=window.get("notes", []),
+    )
     for k, v in metrics.items():
-        repl(f"{{{{ metrics.{k} }}}}", v)
-
-    repl("{{ artifact_path }}", artifact_path)
-    repl("{{ version_metrics }}", version_metrics)
-    repl("{{ version_logging }}", version_logging)
-    repl(
-    "{{ generated_at }}",
-    datetime.now(timezone.utc).isoformat()
-)
+        vals[f"metrics_{k}"] = v
 
-    # Warnings block (simple)
-    if warnings:
-        md = md.replace("{{#if warnings}}", "").replace("{{/if}}", "")
-        md = md.replace("{{#each warnings}}", "").replace("{{/each}}", "")
-        md = md.replace("{{ this }}", "\n".join(f"- {w}" for w in warnings))
-    else:
-        md = md.replace("{{#if warnings}}", "").replace("{{/if}}", "")
-        md = md.replace("{{else}}", "").replace("- None", "- None")
+    for name, (key, head, item, fallback) in _SECTIONS.items():
+        items = vals.get(key)
+        if items:
+            vals[name] = head + "".join(item.format(this=x) for x in items)
+        else:
+            vals[name] = fallback
 
-    return md
+    return _FORMAT.format_map(vals)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+import math
+
+try:  # optional: vectorised quantiles for large samples
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
+# Below this size the numpy conversion costs more than the pure-Python path
+_NUMPY_MIN_N = 1000
+
+def quantiles(xs: Sequence[float], qs: Sequence[float]) -> List[float | None]:
+    """
+    Linear-interpolated quantiles (numpy's default method) of xs for every q in qs.
+    Sorts at most once per call, however many quantiles are requested.
+    Returns [None] * len(qs) for an empty sample.
+    """
+    n = len(xs)
+    if not n:
+        return [None] * len(qs)
+    if np is not None and n >= _NUMPY_MIN_N:
+        # np.quantile selects with np.partition (O(N) per order statistic), not a full sort
+        arr = np.fromiter(xs, dtype=np.float64, count=n)
+        return [float(v) for v in np.quantile(arr, qs)]
+
+    # (lo, hi, frac) per quantile; order statistics 0 and n-1 are min/max
+    pos = []
+    for q in qs:
+        i = (n - 1) * q
+        lo, hi = int(math.floor(i)), int(math.ceil(i))
+        pos.append((lo, hi, i - lo))
+    if all(k in (0, n - 1) for lo, hi, _ in pos for k in (lo, hi)):
+        # only extremes requested (q=0/1, or n <= 2): two O(N) scans instead of a sort
+        ends = {0: min(xs), n - 1: max(xs)}
+        get = ends.__getitem__
+    else:
+        get = sorted(xs).__getitem__
+
+    out: List[float | None] = []
+    for lo, hi, f in pos:
+        if lo == hi:
+            out.append(get(lo))
+        else:
+            out.append(get(lo) * (1 - f) + get(hi) * f)
+    return out
+
+def quantile_matrix(groups: Sequence[Sequence[float]], qs: Sequence[float]) -> List[List[float | None]]:
+    """
+    Series-major quantile matrix: out[i][j] is quantile qs[i] of groups[j].
+    Each group is sorted (or partitioned) once for all of qs.
+    """
+    columns = [quantiles(xs, qs) for xs in groups]
+    return [list(row) for row in zip(*columns)] if columns else [[] for _ in qs]
+
+def summarize(xs: Sequence[float], qs: Sequence[float]) -> Tuple[float, List[float | None]]:
+    """
+    (mean, quantiles(xs, qs)) from one array on the numpy path;
+    the mean is 0.0 for an empty sample.
+    """
+    n = len(xs)
+    if np is not None and n >= _NUMPY_MIN_N:
+        arr = np.fromiter(xs, dtype=np.float64, count=n)
+        return float(arr.mean()), [float(v) for v in np.quantile(arr, qs)]
+    return (sum(xs) / n if n else 0.0), quantiles(xs, qs)
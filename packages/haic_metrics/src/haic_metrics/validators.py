@@ -2,6 +2,9 @@ from typing import Any, Dict, List, Tuple, Optional
 
 JsonDict = Dict[str, Any]
 
+_TIME_KEYS = frozenset(("timestamp", "ts", "t", "time"))
+_TYPE_KEYS = frozenset(("event_type", "action", "type"))
+
 
 def validate_decisions_minimal(decisions: List[JsonDict]) -> Tuple[bool, List[str]]:
     """
@@ -16,19 +19,31 @@ def validate_decisions_minimal(decisions: List[JsonDict]) -> Tuple[bool, List[st
         warnings.append("decisions list is empty")
         return True, warnings  # not fatal
 
-    # Check a few rows
+    # Check a few rows; schema hints are aggregated into one warning per kind
     sample = decisions[:10]
+    no_time: List[int] = []
+    no_type: List[int] = []
     for idx, d in enumerate(sample):
         if not isinstance(d, dict):
             return False, [f"decision[{idx}] is not a dict"]
 
-        # Not enforcing a strict schema; just sanity hints
-        has_any_time = any(k in d for k in ("timestamp", "ts", "t", "time"))
-        if not has_any_time:
-            warnings.append(f"decision[{idx}] has no timestamp key (timestamp/ts/t/time).")
-
-        has_any_type = any(k in d for k in ("event_type", "action", "type"))
-        if not has_any_type:
-            warnings.append(f"decision[{idx}] has no type key (event_type/action/type).")
+        # Not enforcing a strict schema; just sanity hints.
+        # isdisjoint walks the row's keys once in C instead of one `in` per alias.
+        if _TIME_KEYS.isdisjoint(d):
+            no_time.append(idx)
+        if _TYPE_KEYS.isdisjoint(d):
+            no_type.append(idx)
+
+    n = len(sample)
+    if no_time:
+        warnings.append(
+            f"{len(no_time)} of {n} sampled decisions have no timestamp key (timestamp/ts/t/time), "
+            f"first at decision[{no_time[0]}]."
+        )
+    if no_type:
+        warnings.append(
+            f"{len(no_type)} of {n} sampled decisions have no type key (event_type/action/type), "
+            f"first at decision[{no_type[0]}]."
+        )
 
     return True, warnings
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice, repeat
+from operator import le
 from typing import Any, Dict, List, Optional, Tuple, Union, Literal
 
 JsonDict = Dict[str, Any]
 
+_UTC = timezone.utc
+
+# 't' types the binary-search selection handles (exact types: no bools)
+_PLAIN_NUMBER_TYPES = frozenset((float, int))
+# Bound keys a window may carry, and the start/end pair
+_BOUND_KEYS = frozenset(("start", "end", "last"))
+_START_END = frozenset(("start", "end"))
+
+# Shared window_summary["notes"] for the common case where nothing was noted
+_EMPTY_NOTES: Tuple[str, ...] = ()
+
 
 def _is_number(x: Any) -> bool:
-    return isinstance(x, (int, float)) and not isinstance(x, bool)
+    t = type(x)
+    if t is float or t is int:  # exact types: pointer compares, and type(True) is bool
+        return True
+    # subclasses (numpy scalars, IntEnum, ...) still count; bool never does
+    return t is not bool and isinstance(x, (int, float))
 
 
 def parse_time_value(v: Union[float, int, str], *, notes: Optional[List[str]] = None) -> float:
@@ -25,24 +44,34 @@ def parse_time_value(v: Union[float, int, str], *, notes: Optional[List[str]] =
     if not isinstance(v, str):
         raise ValueError(f"Unsupported time value type: {type(v)}")
 
-    s = v.strip()
-
-    # Normalize 'Z' to '+00:00' for fromisoformat
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-
     try:
-        dt = datetime.fromisoformat(s)
+        epoch, was_naive = _iso_to_epoch(v)
     except Exception as e:
         raise ValueError(f"Invalid ISO datetime: {v!r}") from e
 
-    if dt.tzinfo is None:
-        # assume UTC, but make it visible
-        if notes is not None:
-            notes.append("Naive ISO datetime provided; assuming UTC.")
-        dt = dt.replace(tzinfo=timezone.utc)
+    if was_naive and notes is not None:
+        # assumed UTC, but make it visible
+        notes.append("Naive ISO datetime provided; assuming UTC.")
+
+    return epoch
+
 
-    return dt.timestamp()
+# Windows and artifacts tend to repeat the same few ISO strings; keyed on the raw
+# string so a repeat also skips the strip / 'Z' rewrite
+@lru_cache(maxsize=4096)
+def _iso_to_epoch(v: str) -> Tuple[float, bool]:
+    """(epoch seconds, was_naive) for an ISO string; naive values are taken as UTC."""
+    s = v.strip()
+
+    # Normalize 'Z' to '+00:00' for fromisoformat (only 3.11+ accepts 'Z' itself)
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+
+    dt = datetime.fromisoformat(s)
+    was_naive = dt.tzinfo is None
+    if was_naive:
+        dt = dt.replace(tzinfo=_UTC)
+    return dt.timestamp(), was_naive
 
 
 def _get_meta_start_end_epoch(artifact: Optional[JsonDict]) -> Tuple[Optional[float], Optional[float]]:
@@ -63,28 +92,111 @@ def _get_meta_start_end_epoch(artifact: Optional[JsonDict]) -> Tuple[Optional[fl
 
 
 def _min_max_t_epoch(decisions: List[JsonDict]) -> Tuple[Optional[float], Optional[float]]:
-    t_vals: List[float] = []
-    for d in decisions:
-        if isinstance(d, dict) and _is_number(d.get("t")):
-            t_vals.append(float(d["t"]))
+    _, t_min, t_max = _scan_decisions(decisions)
+    return t_min, t_max
+
+
+def _scan_decisions(decisions: List[JsonDict]) -> Tuple[int, Optional[float], Optional[float]]:
+    """
+    (dict rows, min numeric t, max numeric t) from one walk over the decisions,
+    so the windowing code does not re-traverse the list for each statistic.
+    """
+    try:
+        # map over the unbound dict.get runs the per-row call in C; it raises
+        # TypeError on the first non-dict row, which then takes the filtered path
+        raw_t = list(map(dict.get, decisions, repeat("t")))
+    except TypeError:
+        raw_t = [d.get("t") for d in decisions if isinstance(d, dict)]
+    # usually every t is already a float (JSON); only a mixed column pays for float()
+    t_vals = [t for t in raw_t if type(t) is float]
+    if len(t_vals) != len(raw_t):
+        t_vals = [float(t) for t in raw_t if _is_number(t)]
     if not t_vals:
-        return None, None
-    return min(t_vals), max(t_vals)
+        return len(raw_t), None, None
+    return len(raw_t), min(t_vals), max(t_vals)
+
+
+def _select_in_window(
+    rows: List[JsonDict],
+    t_start: float,
+    t_end: float,
+) -> Tuple[List[JsonDict], int, int]:
+    """
+    (rows, missing_t, n_dicts): dict rows with numeric 't' inside [t_start, t_end],
+    the count of dict rows missing a numeric 't', and the count of dict rows seen.
+    When nothing is excluded the input list itself is returned.
+    """
+    sliced = _slice_sorted(rows, t_start, t_end)
+    if sliced is not None:
+        return sliced, 0, len(rows)  # every row is a dict on this path
+
+    # One pass that selects and tallies together. 't' is read EAFP-style (rows
+    # almost always carry it), and floats, what JSON yields, skip the _is_number call.
+    kept: List[JsonDict] = []
+    append = kept.append
+    missing_t = outside = 0
+    for d in rows:
+        if not isinstance(d, dict):
+            continue
+        try:
+            t = d["t"]
+        except KeyError:
+            missing_t += 1
+            continue
+        if type(t) is float or _is_number(t):
+            if t_start <= t <= t_end:
+                append(d)
+            else:
+                outside += 1
+        else:
+            missing_t += 1
+    n_dicts = len(kept) + missing_t + outside
+    if len(kept) == len(rows):
+        return rows, 0, n_dicts
+    return kept, missing_t, n_dicts
+
+
+def _slice_sorted(rows: List[JsonDict], t_start: float, t_end: float) -> Optional[List[JsonDict]]:
+    """
+    Window selection by binary search, for the usual case of dict rows with a plain
+    int/float 't' logged in time order: one C-level pass extracts the times and
+    checks the order, then two bisects find the slice. None when the rows do not
+    qualify (non-dict row, missing or non-numeric 't', out-of-order or NaN times),
+    and the caller falls back to the linear scan.
+    """
+    try:
+        ts = list(map(dict.get, rows, repeat("t")))
+    except TypeError:  # a non-dict row
+        return None
+    if not set(map(type, ts)) <= _PLAIN_NUMBER_TYPES:
+        return None
+    # NaN compares False either way, so a NaN anywhere fails the pairwise order
+    # check; a lone row has no pair, hence its self-comparison
+    if not all(map(le, ts, islice(ts, 1, None))) or (len(ts) == 1 and not ts[0] <= ts[0]):
+        return None
+    lo = bisect_left(ts, t_start)
+    hi = bisect_right(ts, t_end)
+    return rows if (lo == 0 and hi == len(rows)) else rows[lo:hi]
 
 
 def get_session_start_epoch(
     artifact: Optional[JsonDict],
     decisions: List[JsonDict],
     notes: List[str],
+    *,
+    t_range: Optional[Tuple[Optional[float], Optional[float]]] = None,
+    meta_range: Optional[Tuple[Optional[float], Optional[float]]] = None,
 ) -> Optional[float]:
     """
     Prefer artifact meta.timestamps.start_time; fallback to min(decision['t']).
+    t_range / meta_range: (min, max) decision t and (start, end) meta epochs
+    already computed by the caller, if any.
     """
-    meta_start, _ = _get_meta_start_end_epoch(artifact)
+    meta_start, _ = meta_range if meta_range is not None else _get_meta_start_end_epoch(artifact)
     if meta_start is not None:
         return meta_start
 
-    d_min, _ = _min_max_t_epoch(decisions)
+    d_min, _ = t_range if t_range is not None else _min_max_t_epoch(decisions)
     if d_min is not None:
         notes.append("Fallback: meta.timestamps.start_time missing; using min(decision.t) as session start.")
         return d_min
@@ -97,6 +209,8 @@ def resolve_window_bounds(
     artifact: Optional[JsonDict],
     decisions: List[JsonDict],
     window: Dict[str, Any],
+    *,
+    t_range: Optional[Tuple[Optional[float], Optional[float]]] = None,
 ) -> Tuple[Optional[float], Optional[float], Dict[str, Any], List[str]]:
     """
     Returns:
@@ -104,8 +218,10 @@ def resolve_window_bounds(
 
     effective_meta includes:
       - basis
-      - requested (verbatim window)
+      - requested (the caller's window dict itself, not a copy; treat as read-only)
       - effective (epoch + relative if basis=relative)
+
+    t_range: (min, max) decision t already computed by the caller, if any.
     """
     notes: List[str] = []
 
@@ -116,33 +232,37 @@ def resolve_window_bounds(
     if basis not in ("relative", "absolute"):
         raise ValueError("window['basis'] must be 'relative' or 'absolute'")
 
-    requested = dict(window)
+    requested = window  # reported verbatim; never mutated here, so no defensive copy
 
-    # Validate mutually exclusive keys
-    has_start = "start" in window
-    has_end = "end" in window
-    has_last = "last" in window
+    # Validate mutually exclusive keys: one set intersection instead of three probes
+    bounds = window.keys() & _BOUND_KEYS
+    has_last = "last" in bounds
+    has_start_end = bounds >= _START_END
 
     if basis == "relative":
-        if has_last and (has_start or has_end):
-            raise ValueError("For relative windows, use either {'last': N} or {'start':..., 'end':...}, not both.")
         if has_last:
+            if len(bounds) > 1:
+                raise ValueError("For relative windows, use either {'last': N} or {'start':..., 'end':...}, not both.")
             if not _is_number(window["last"]):
                 raise ValueError("window['last'] must be a number (seconds) for relative windows.")
         else:
-            if not (has_start and has_end):
+            if not has_start_end:
                 raise ValueError("Relative window requires both 'start' and 'end' (seconds) unless using 'last'.")
             if not (_is_number(window["start"]) and _is_number(window["end"])):
                 raise ValueError("Relative window 'start'/'end' must be numbers (seconds).")
 
-        t0 = get_session_start_epoch(artifact, decisions, notes)
+        if t_range is None:
+            t_range = _min_max_t_epoch(decisions)
+        meta_range = _get_meta_start_end_epoch(artifact)
+        t0 = get_session_start_epoch(artifact, decisions, notes, t_range=t_range, meta_range=meta_range)
         if t0 is None:
             # Cannot resolve relative bounds without a reference start
             return None, None, {"basis": basis, "requested": requested, "effective": {}}, notes
+        t0 = float(t0)  # once, instead of at every use below
 
         # Determine session end for 'last'
-        meta_start, meta_end = _get_meta_start_end_epoch(artifact)
-        d_min, d_max = _min_max_t_epoch(decisions)
+        _, meta_end = meta_range
+        _, d_max = t_range
         session_end = meta_end if meta_end is not None else d_max
 
         if has_last:
@@ -151,29 +271,29 @@ def resolve_window_bounds(
                 return None, None, {"basis": basis, "requested": requested, "effective": {}}, notes
             last_s = float(window["last"])
             t_end = float(session_end)
-            t_start = max(float(t0), t_end - last_s)
-            rel_start = t_start - float(t0)
-            rel_end = t_end - float(t0)
+            t_start = max(t0, t_end - last_s)
+            rel_start = t_start - t0
+            rel_end = t_end - t0
         else:
             rel_start = float(window["start"])
             rel_end = float(window["end"])
             if rel_end < rel_start:
                 raise ValueError("Relative window 'end' must be >= 'start'.")
-            t_start = float(t0) + rel_start
-            t_end = float(t0) + rel_end
+            t_start = t0 + rel_start
+            t_end = t0 + rel_end
 
         effective = {
             "t_start_epoch": t_start,
             "t_end_epoch": t_end,
             "t_start_rel_s": rel_start,
             "t_end_rel_s": rel_end,
-            "session_start_epoch": float(t0),
+            "session_start_epoch": t0,
         }
 
         return t_start, t_end, {"basis": basis, "requested": requested, "effective": effective}, notes
 
     # basis == "absolute"
-    if not (has_start and has_end):
+    if not has_start_end:
         raise ValueError("Absolute window requires both 'start' and 'end' (epoch seconds or ISO strings).")
 
     t_start = parse_time_value(window["start"], notes=notes)
@@ -182,11 +302,12 @@ def resolve_window_bounds(
     if t_end < t_start:
         raise ValueError("Absolute window 'end' must be >= 'start'.")
 
+    # parse_time_value always returns floats
     effective = {
-        "t_start_epoch": float(t_start),
-        "t_end_epoch": float(t_end),
+        "t_start_epoch": t_start,
+        "t_end_epoch": t_end,
     }
-    return float(t_start), float(t_end), {"basis": basis, "requested": requested, "effective": effective}, notes
+    return t_start, t_end, {"basis": basis, "requested": requested, "effective": effective}, notes
 
 
 def filter_decisions_events_by_epoch(
@@ -196,24 +317,38 @@ def filter_decisions_events_by_epoch(
 ) -> Tuple[List[JsonDict], List[JsonDict], Dict[str, Any]]:
     """
     Returns (decisions_filt, events_filt, window_summary)
+    (decisions_filt / events_filt may be the input lists themselves when nothing is excluded.)
 
     - If window is None: passthrough + summary that indicates full range.
     - If artifact contains 'events', filter them too; else events_filt=[].
     - Summary includes counts before/after and effective duration.
     """
-    # Collect events (if present)
+    return _resolve_and_filter(artifact, decisions, window)
+
+
+def _resolve_and_filter(
+    artifact: Optional[JsonDict],
+    decisions: List[JsonDict],
+    window: Optional[Dict[str, Any]],
+) -> Tuple[List[JsonDict], List[JsonDict], Dict[str, Any]]:
+    """
+    filter_decisions_events_by_epoch without redundant passes: the decisions are
+    scanned for their t range only when something needs it (no window, or a
+    relative one); otherwise the selection pass also yields the totals.
+    """
+    # Collect events (if present); non-dict entries are skipped, but the list is only
+    # copied to drop them when there are any (and never for windowed selection,
+    # which skips them itself)
     events: List[JsonDict] = []
     if artifact and isinstance(artifact, dict):
         ev = artifact.get("events")
         if isinstance(ev, list):
-            events = [e for e in ev if isinstance(e, dict)]
-
-    decisions_total = len([d for d in decisions if isinstance(d, dict)])
-    events_total = len(events)
+            events = ev
 
     # No window -> passthrough with a minimal summary
     if window is None:
-        d_min, d_max = _min_max_t_epoch(decisions)
+        decisions_total, d_min, d_max = _scan_decisions(decisions)
+        events_total = sum(1 for e in events if isinstance(e, dict))
         duration_s = 0.0
         if d_min is not None and d_max is not None:
             duration_s = max(0.0, d_max - d_min)
@@ -231,23 +366,29 @@ def filter_decisions_events_by_epoch(
                 "events_used": events_total,
             },
             "duration_s": duration_s,
-            "notes": [],
+            "notes": _EMPTY_NOTES,
         }
+        if events_total != len(events):
+            events = [e for e in events if isinstance(e, dict)]
         return decisions, events, window_summary
 
-    # Resolve bounds
-    t_start, t_end, eff_meta, notes = resolve_window_bounds(artifact, decisions, window)
+    # Resolve bounds; only relative windows depend on the decisions' t range
+    t_range = None
+    if isinstance(window, dict) and window.get("basis") == "relative":
+        decisions_total, d_min, d_max = _scan_decisions(decisions)
+        t_range = (d_min, d_max)
+    t_start, t_end, eff_meta, notes = resolve_window_bounds(artifact, decisions, window, t_range=t_range)
 
     if t_start is None or t_end is None:
-        # can't filter reliably
+        # can't filter reliably (only reachable for relative windows, so the scan ran)
         window_summary = {
             "basis": eff_meta.get("basis", "unknown"),
-            "requested": eff_meta.get("requested", dict(window)),
+            "requested": eff_meta.get("requested", window),
             "effective": eff_meta.get("effective", {}),
             "counts": {
                 "decisions_total": decisions_total,
                 "decisions_used": 0,
-                "events_total": events_total,
+                "events_total": sum(1 for e in events if isinstance(e, dict)),
                 "events_used": 0,
             },
             "duration_s": 0.0,
@@ -255,39 +396,21 @@ def filter_decisions_events_by_epoch(
         }
         return [], [], window_summary
 
-    # Filter decisions/events
-    missing_t_decisions = 0
-    decisions_f: List[JsonDict] = []
-    for d in decisions:
-        if not isinstance(d, dict):
-            continue
-        if not _is_number(d.get("t")):
-            missing_t_decisions += 1
-            continue
-        tt = float(d["t"])
-        if t_start <= tt <= t_end:
-            decisions_f.append(d)
-
-    missing_t_events = 0
-    events_f: List[JsonDict] = []
-    for e in events:
-        if not _is_number(e.get("t")):
-            missing_t_events += 1
-            continue
-        tt = float(e["t"])
-        if t_start <= tt <= t_end:
-            events_f.append(e)
+    # Filter decisions/events (no copy when the window keeps every row); the same
+    # pass counts the dict rows for the totals
+    decisions_f, missing_t_decisions, decisions_total = _select_in_window(decisions, t_start, t_end)
+    events_f, missing_t_events, events_total = _select_in_window(events, t_start, t_end)
 
     if missing_t_decisions:
         notes.append(f"{missing_t_decisions} decisions missing numeric 't' were excluded from windowing.")
     if missing_t_events:
         notes.append(f"{missing_t_events} events missing numeric 't' were excluded from windowing.")
 
-    duration_s = max(0.0, float(t_end) - float(t_start))
+    duration_s = max(0.0, t_end - t_start)
 
     window_summary = {
         "basis": eff_meta.get("basis", "unknown"),
-        "requested": eff_meta.get("requested", dict(window)),
+        "requested": eff_meta.get("requested", window),
         "effective": eff_meta.get("effective", {}),
         "counts": {
             "decisions_total": decisions_total,
@@ -296,6 +419,6 @@ def filter_decisions_events_by_epoch(
             "events_used": len(events_f),
         },
         "duration_s": duration_s,
-        "notes": notes,
+        "notes": notes or _EMPTY_NOTES,
     }
     return decisions_f, events_f, window_summary
@@ -1,3 +1,5 @@
+import pytest
+
 from haic_metrics import compute_metrics
 
 def test_core_profile_smoke():
@@ -17,3 +19,105 @@ def test_full_profile_smoke():
     ]
     out = compute_metrics(decisions, profile="full")
     assert "outcome_precision" in out["metrics"]
+
+def test_percentile_matrix_is_series_major():
+    from haic_metrics.human_rt import human_response_percentiles_by
+    root = {"logs": [
+        {"pilot_tag": "a", "decisions": [{"actor_type": "human", "duration_s": x} for x in (5, 1, 3, 2, 9, 4.5)]},
+        {"pilot_tag": "b", "decisions": [{"actor_type": "human", "duration_s": 1}]},
+    ]}
+    out = human_response_percentiles_by(root, quantiles=(0.5, 0.9))
+    assert out["labels"] == ["a", "b"]
+    assert out["data"] == [[3.75, 1.0], [7.0, 1.0]]
+
+def test_cached_results_track_input_content():
+    decisions = [
+        {"actor_type": "human", "event_type": "label_received", "duration_s": 2.0, "timestamp": 1},
+        {"actor_type": "human", "event_type": "label_received", "duration_s": 4.0, "timestamp": 3},
+    ]
+    first = compute_metrics(decisions, use_cache=True)
+    again = compute_metrics(decisions, use_cache=True)
+    assert again == first and again is not first
+
+    decisions[1]["duration_s"] = 8.0
+    changed = compute_metrics(decisions, use_cache=True)
+    assert changed["metrics"]["human_rt_mean_s"] == 5.0
+
+def test_outcome_metrics_accept_a_decisions_frame():
+    from haic_metrics.columnar import DecisionsFrame
+    from haic_metrics.outcome_metrics import compute_outcome_metrics
+    decisions = [
+        {"ai_label": "neg", "prediction": "pos", "ground_truth": "pos", "trust_rating": 3, "trust_scale_maximum": 5},
+        {"prediction": "pos", "label": "neg", "trust_rating": "bad"},
+        {"result": "false_negative"},
+    ]
+    frame = DecisionsFrame.from_rows(decisions)
+    assert frame.col("prediction") == ["pos", "pos", None]  # first alias wins
+    assert compute_outcome_metrics(frame) == compute_outcome_metrics(decisions)
+
+
+def test_online_aggregator_matches_batch_outcomes():
+    from haic_metrics.outcome_metrics import Metrics, compute_outcome_metrics
+    decisions = [
+        {"prediction": "pos", "ground_truth": "pos", "trust_rating": 4, "trust_scale_maximum": 5},
+        {"prediction": "pos", "label": "neg"},
+        {"result": "true_negative", "trust_rating": 1, "trust_scale_maximum": 5},
+    ]
+    agg = Metrics.OnlineAggregator()
+    for row in decisions:
+        agg.update(row)
+    assert agg.snapshot() == compute_outcome_metrics(decisions)
+    agg.extend(decisions)
+    assert agg.snapshot() == compute_outcome_metrics(decisions + decisions)
+
+
+def test_online_aggregators_merge_across_shards():
+    import pickle
+    from haic_metrics.outcome_metrics import Metrics, compute_outcome_metrics
+    decisions = [
+        {"prediction": "pos", "ground_truth": "neg", "trust_rating": 2, "trust_scale_maximum": 5},
+        {"result": "true_positive"},
+        {"prediction": "no", "ground_truth": "no", "trust_rating": 5, "trust_scale_maximum": 5},
+    ]
+    shards = []
+    for part in (decisions[:1], decisions[1:]):
+        agg = Metrics.OnlineAggregator()
+        agg.extend(part)
+        shards.append(pickle.loads(pickle.dumps(agg)))  # as returned by a worker process
+    merged = shards[0].merge(shards[1])
+    assert merged.snapshot() == compute_outcome_metrics(decisions)
+
+
+def test_loaders_accept_nan_tokens(tmp_path):
+    import math
+    from haic_metrics.io import load_json, load_jsonl
+
+    (tmp_path / "a.json").write_text('{"decisions": [{"t": 1.0, "duration_s": NaN}]}')
+    (tmp_path / "a.jsonl").write_text('{"t": 1.0, "duration_s": NaN}\n{"t": 2.0, "duration_s": Infinity}\n')
+    assert math.isnan(load_json(tmp_path / "a.json")["decisions"][0]["duration_s"])
+    rows = load_jsonl(tmp_path / "a.jsonl")
+    assert math.isnan(rows[0]["duration_s"]) and rows[1]["duration_s"] == math.inf
+
+    (tmp_path / "bad.jsonl").write_text('{"t": 1.0}\n{"t": \n')
+    with pytest.raises(ValueError, match="line 2"):
+        load_jsonl(tmp_path / "bad.jsonl")
+
+
+def test_string_t_time_window_matches_min_max_semantics():
+    from haic_metrics.interaction_metrics import compute_metrics as interaction_metrics
+
+    # mixed str/number t has no t-range: no timestamps either, so no time window
+    mixed = [{"t": "0", "actor_type": "human", "duration_s": 1.0}, {"t": 30.0, "actor_type": "ai", "duration_s": 1.0}]
+    assert interaction_metrics(decisions=mixed)["F"] == 0.0
+    # all-string t compares as strings: max "9" - min "10" < 0, so no time window
+    strings = [{"t": "9", "actor_type": "human", "duration_s": 1.0}, {"t": "10", "actor_type": "ai", "duration_s": 1.0}]
+    assert interaction_metrics(decisions=strings)["F"] == 0.0
+    numeric = [{"t": 0.0, "actor_type": "human", "duration_s": 1.0}, {"t": 30.0, "actor_type": "ai", "duration_s": 1.0}]
+    assert interaction_metrics(decisions=numeric)["F"] == 4.0
+
+
+def test_signed_zero_labels_are_not_merged():
+    from haic_metrics.outcome_metrics import compute_outcome_metrics
+
+    rows = [{"ground_truth": 0.0, "prediction": 0.0}, {"ground_truth": -0.0, "prediction": 0.0}]
+    assert compute_outcome_metrics(rows)["outcome_human_ai_agreement_rate"] == 0.5
@@ -63,4 +63,26 @@ def test_markdown_report_golden_structure():
     # Reproducibility
     assert "## Reproducibility" in md
     assert "artifact:" in md.lower()
-    assert "haic-metrics" in md.lower()
\ No newline at end of file
+    assert "haic-metrics" in md.lower()
+
+def test_markdown_report_fills_every_marker():
+    result = {
+        "metrics": {"F": 1.5},
+        "window_summary": {"basis": "relative", "notes": ["clamped end"]},
+        "warnings": ["missing {t}"],
+    }
+
+    md = render_markdown_report(
+        result=result,
+        artifact={"meta": {"run_id": "run-1"}},
+        artifact_path="dummy.json",
+        version_metrics="0.1.1",
+        version_logging="0.1.0",
+    )
+
+    assert "{{" not in md and "}}" not in md
+    assert "- **run_id:** run-1" in md
+    assert "| F (frequency) | 1.5 |" in md
+    assert "- clamped end" in md
+    assert "- missing {t}" in md
+    assert "- None" not in md
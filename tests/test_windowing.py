@@ -27,3 +27,11 @@ def test_absolute_iso_window():
 
     assert len(d_f) == 2
     assert summary["duration_s"] == 600.0
+
+
+def test_nan_t_row_is_not_selected():
+    window = {"basis": "absolute", "start": 0, "end": 10}
+    for decisions in ([{"t": float("nan")}], [{"t": 1.0}, {"t": float("nan")}], [{"t": float("nan")}, {"t": 1.0}]):
+        d_f, _, summary = filter_decisions_events_by_epoch(artifact=None, decisions=decisions, window=window)
+        assert [d["t"] for d in d_f] == [1.0] * (len(decisions) - 1)
+        assert summary["counts"]["decisions_used"] == len(decisions) - 1